@@ -418,12 +418,14 @@ func (h *AutomationHandler) CreateSLAConfig(c *gin.Context) {
 // @Accept json
 // @Produce json
 // @Param is_active query boolean false "是否激活"
+// @Param search query string false "按名称或描述搜索"
 // @Param page query int false "页码" default(1)
 // @Param page_size query int false "页大小" default(20)
 // @Success 200 {object} map[string]interface{} "成功"
 // @Failure 500 {object} map[string]interface{} "服务器错误"
 // @Router /api/admin/automation/sla [get]
 func (h *AutomationHandler) GetSLAConfigs(c *gin.Context) {
+	search := strings.TrimSpace(c.Query("search"))
 	var isActive *bool
 	if activeStr := c.Query("is_active"); activeStr != "" {
 		active := activeStr == "true"
@@ -433,7 +435,7 @@ func (h *AutomationHandler) GetSLAConfigs(c *gin.Context) {
 	page, _ := strconv.Atoi(c.DefaultQuery("page", "1"))
 	pageSize, _ := strconv.Atoi(c.DefaultQuery("page_size", "20"))
 
-	configs, total, err := h.automationService.GetSLAConfigs(c.Request.Context(), isActive, page, pageSize)
+	configs, total, err := h.automationService.GetSLAConfigs(c.Request.Context(), isActive, search, page, pageSize)
 	if err != nil {
 		c.JSON(http.StatusInternalServerError, gin.H{
 			"success": false,
@@ -698,12 +698,16 @@ func (s *AutomationService) CreateSLAConfig(ctx context.Context, req *models.SLA
 }
 
 // GetSLAConfigs 获取SLA配置列表
-func (s *AutomationService) GetSLAConfigs(ctx context.Context, isActive *bool, page, pageSize int) ([]*models.SLAConfig, int64, error) {
+func (s *AutomationService) GetSLAConfigs(ctx context.Context, isActive *bool, search string, page, pageSize int) ([]*models.SLAConfig, int64, error) {
 	query := s.db.WithContext(ctx).Model(&models.SLAConfig{})
 
 	if isActive != nil {
 		query = query.Where("is_active = ?", *isActive)
 	}
+	if search = strings.TrimSpace(search); search != "" {
+		like := fmt.Sprintf("%%%s%%", strings.ToLower(search))
+		query = query.Where("lower(name) LIKE ? OR lower(description) LIKE ?", like, like)
+	}
 
 	var total int64
 	if err := query.Count(&total).Error; err != nil {
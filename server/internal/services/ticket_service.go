@@ -576,6 +576,12 @@ func (s *TicketService) AssignTicket(ticketID uint, assigneeID uint, userID uint
 		return nil, err
 	}
 
+	// 同步预加载的处理人，使返回结果中的 assigned_to 为新分配的用户
+	var assignee models.User
+	if err := s.db.First(&assignee, assigneeID).Error; err == nil {
+		ticket.AssignedTo = &assignee
+	}
+
 	go func() {
 		if err := s.notificationService.NotifyTicketAssigned(context.Background(), ticket, userID); err != nil {
 			fmt.Printf("Failed to send assignment notification: %v\n", err)
@@ -13,10 +13,16 @@ FE008 工单流程自动化功能测试脚本
 8. 规则统计信息
 """
 
+import base64
 import json
+import os
+import socket
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
+from urllib.parse import urlparse
 import subprocess
 import sys
 
@@ -25,6 +31,243 @@ BASE_URL = "http://localhost:8081/api"  # 使用dev.sh启动的端口
 TEST_EMAIL = "admin@example.com"
 TEST_PASSWORD = "Admin123!"  # 使用种子数据中的正确密码
 
+# 接口地址：模块加载时拼接一次
+LOGIN_URL = f"{BASE_URL}/auth/login"
+TICKETS_URL = f"{BASE_URL}/tickets"
+RULES_URL = f"{BASE_URL}/admin/automation/rules"
+SLA_URL = f"{BASE_URL}/admin/automation/sla"
+TEMPLATES_URL = f"{BASE_URL}/admin/automation/templates"
+QUICK_REPLIES_URL = f"{BASE_URL}/admin/automation/quick-replies"
+BATCH_UPDATE_URL = f"{BASE_URL}/admin/automation/batch/update"
+BATCH_ASSIGN_URL = f"{BASE_URL}/admin/automation/batch/assign"
+LOGS_URL = f"{BASE_URL}/admin/automation/logs"
+# 可选：设置后缓存登录token（如 ~/.chronodesk_testtoken），过期前复用以跳过登录请求
+TOKEN_CACHE_FILE = os.getenv("FE008_TOKEN_CACHE")
+
+# 测试数据：模块级常量，只构建一次
+ASSIGNMENT_RULE = {
+    "name": "高优先级工单自动分配",
+    "description": "将高优先级工单自动分配给管理员",
+    "rule_type": "assignment",
+    "trigger_event": "ticket.created",
+    "conditions": [
+        {
+            "field": "priority",
+            "operator": "eq",
+            "value": "high",
+            "logic_op": "and"
+        }
+    ],
+    "actions": [
+        {
+            "type": "assign",
+            "params": {
+                "user_id": 1
+            }
+        }
+    ]
+}
+
+CLASSIFICATION_RULE = {
+    "name": "Bug问题自动分类",
+    "description": "包含bug关键词的工单自动分类为bug类型",
+    "rule_type": "classification",
+    "trigger_event": "ticket.created",
+    "conditions": [
+        {
+            "field": "title",
+            "operator": "contains",
+            "value": "bug",
+            "logic_op": "or"
+        },
+        {
+            "field": "content",
+            "operator": "contains", 
+            "value": "error",
+            "logic_op": "and"
+        }
+    ],
+    "actions": [
+        {
+            "type": "set_priority",
+            "params": {
+                "priority": "high"
+            }
+        },
+        {
+            "type": "add_comment",
+            "params": {
+                "content": "系统自动识别为Bug问题，已提升优先级"
+            }
+        }
+    ]
+}
+
+DEFAULT_SLA = {
+    "name": "标准SLA配置",
+    "description": "适用于一般工单的标准SLA",
+    "is_default": True,
+    "response_time": 60,  # 60分钟响应时间
+    "resolution_time": 480,  # 8小时解决时间
+    "working_hours": {
+        "monday": {"start": "09:00", "end": "18:00"},
+        "tuesday": {"start": "09:00", "end": "18:00"},
+        "wednesday": {"start": "09:00", "end": "18:00"},
+        "thursday": {"start": "09:00", "end": "18:00"},
+        "friday": {"start": "09:00", "end": "18:00"},
+        "saturday": {"start": "", "end": ""},
+        "sunday": {"start": "", "end": ""}
+    },
+    "escalation_rules": [
+        {
+            "trigger_minutes": 120,
+            "action": "notify_admin",
+            "notify_users": [1]
+        },
+        {
+            "trigger_minutes": 240,
+            "action": "escalate_to_manager",
+            "target_user_id": 1
+        }
+    ]
+}
+
+HIGH_PRIORITY_SLA = {
+    "name": "高优先级SLA配置",
+    "description": "适用于高优先级工单的SLA",
+    "priority": "high",
+    "response_time": 30,  # 30分钟响应时间
+    "resolution_time": 240,  # 4小时解决时间
+    "escalation_rules": [
+        {
+            "trigger_minutes": 60,
+            "action": "escalate_to_manager",
+            "target_user_id": 1
+        }
+    ]
+}
+
+BUG_TEMPLATE = {
+    "name": "Bug报告模板",
+    "description": "用于报告系统Bug的标准模板",
+    "category": "bug",
+    "title_template": "[Bug] {{summary}}",
+    "content_template": """
+**问题描述：**
+{{description}}
+
+**重现步骤：**
+1. {{step1}}
+2. {{step2}}
+3. {{step3}}
+
+**期望结果：**
+{{expected}}
+
+**实际结果：**
+{{actual}}
+
+**环境信息：**
+- 操作系统: {{os}}
+- 浏览器: {{browser}}
+- 版本: {{version}}
+""",
+    "default_type": "bug",
+    "default_priority": "normal",
+    "default_status": "open",
+    "custom_fields": [
+        {
+            "name": "summary",
+            "type": "text",
+            "label": "问题摘要",
+            "required": True
+        },
+        {
+            "name": "description", 
+            "type": "textarea",
+            "label": "详细描述",
+            "required": True
+        },
+        {
+            "name": "severity",
+            "type": "select",
+            "label": "严重程度",
+            "options": ["低", "中", "高", "紧急"]
+        }
+    ]
+}
+
+FEATURE_TEMPLATE = {
+    "name": "功能请求模板",
+    "description": "用于提交新功能请求的模板",
+    "category": "feature",
+    "title_template": "[功能请求] {{feature_name}}",
+    "content_template": """
+**功能名称：**
+{{feature_name}}
+
+**业务需求：**
+{{business_need}}
+
+**详细描述：**
+{{description}}
+
+**验收标准：**
+{{acceptance_criteria}}
+
+**优先级：**
+{{priority}}
+""",
+    "default_type": "feature",
+    "default_priority": "normal",
+    "default_status": "open"
+}
+
+QUICK_REPLIES = [
+    {
+        "name": "感谢反馈",
+        "category": "礼貌用语",
+        "content": "感谢您的反馈，我们会尽快处理您的问题。",
+        "tags": "感谢,反馈",
+        "is_public": True
+    },
+    {
+        "name": "需要更多信息",
+        "category": "信息收集",
+        "content": "为了更好地帮助您解决问题，请提供以下信息：\n1. 问题出现的具体时间\n2. 您的操作步骤\n3. 错误截图或日志",
+        "tags": "信息,详情",
+        "is_public": True
+    },
+    {
+        "name": "问题已解决",
+        "category": "状态更新",
+        "content": "您的问题已经解决，如果还有其他疑问，请随时联系我们。",
+        "tags": "解决,完成",
+        "is_public": True
+    }
+]
+
+TEST_TICKETS = [
+    {
+        "title": "系统出现Bug，无法正常登录",
+        "content": "用户登录时出现错误提示",
+        "type": "support",
+        "priority": "normal"
+    },
+    {
+        "title": "新功能请求：添加数据导出功能",
+        "content": "希望能够添加导出用户数据的功能",
+        "type": "support", 
+        "priority": "normal"
+    },
+    {
+        "title": "紧急问题：系统崩溃",
+        "content": "系统突然崩溃，需要立即处理",
+        "type": "support",
+        "priority": "normal"
+    }
+]
+
 class AutomationTester:
     def __init__(self):
         self.token = None
@@ -36,24 +279,94 @@ class AutomationTester:
         from requests.adapters import HTTPAdapter
         from urllib3.util.retry import Retry
         
-        retry_strategy = Retry(
-            total=3,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"],
-            backoff_factor=1
+        if urlparse(BASE_URL).hostname in ("localhost", "127.0.0.1", "::1"):
+            # 本地服务要么正常要么已挂，退避重试只会拖慢并掩盖问题，快速失败
+            retry_strategy = Retry(
+                total=1,
+                status_forcelist=[502, 503],
+                allowed_methods=["GET"],
+                backoff_factor=0
+            )
+        else:
+            retry_strategy = Retry(
+                total=3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["HEAD", "GET", "OPTIONS"],
+                backoff_factor=1
+            )
+        # 单一后端主机：少量连接池、较大的池容量，并发请求时复用连接而不是丢弃重建
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=4,
+            pool_maxsize=32,
+            pool_block=False
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        self.session.headers["Connection"] = "keep-alive"
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
-        
+
+    def _prepare_post(self, url):
+        """预构建POST请求模板，循环内只替换请求体，避免重复合并请求头和解析URL"""
+        return self.session.prepare_request(requests.Request("POST", url))
+
+    def _send_json(self, template, payload):
+        """基于模板发送JSON请求"""
+        request = template.copy()
+        request.prepare_body(None, None, json=payload)
+        return self.session.send(request)
+
+    def _send_json_many(self, template, payloads):
+        """并发发送一组互不依赖的创建请求，结果顺序与payloads一致"""
+        with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+            return list(executor.map(lambda payload: self._send_json(template, payload), payloads))
+        
+    def _load_cached_token(self):
+        """读取仍在有效期内的缓存token"""
+        if not TOKEN_CACHE_FILE:
+            return None
+        try:
+            with open(os.path.expanduser(TOKEN_CACHE_FILE), "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("base_url") != BASE_URL or cached.get("email") != TEST_EMAIL:
+                return None
+            token = cached["access_token"]
+            payload = token.split(".")[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        except (OSError, ValueError, KeyError, IndexError):
+            return None
+        # 预留60秒余量，避免测试过程中token过期
+        if claims.get("exp", 0) <= time.time() + 60:
+            return None
+        return token
+
+    def _save_cached_token(self, token):
+        """缓存token，文件权限仅限当前用户"""
+        if not TOKEN_CACHE_FILE:
+            return
+        path = os.path.expanduser(TOKEN_CACHE_FILE)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"base_url": BASE_URL, "email": TEST_EMAIL, "access_token": token}, f)
+            os.chmod(path, 0o600)
+        except OSError as e:
+            print(f"⚠️ 缓存token失败: {e}")
+
     def login(self):
         """登录获取token"""
+        cached_token = self._load_cached_token()
+        if cached_token:
+            self.token = cached_token
+            self.session.headers.update({"Authorization": f"Bearer {self.token}"})
+            print("✅ 使用缓存token登录")
+            return True
+
         login_data = {
             "email": TEST_EMAIL,
             "password": TEST_PASSWORD
         }
         
-        response = self.session.post(f"{BASE_URL}/auth/login", json=login_data)
+        response = self.session.post(LOGIN_URL, json=login_data)
         if response.status_code == 200:
             response_data = response.json()
             if response_data.get("code") != 0:
@@ -61,6 +374,7 @@ class AutomationTester:
                 return False
             self.token = response_data["data"]["access_token"]
             self.session.headers.update({"Authorization": f"Bearer {self.token}"})
+            self._save_cached_token(self.token)
             print("✅ 登录成功")
             return True
         else:
@@ -73,30 +387,7 @@ class AutomationTester:
         print("\n=== 测试自动化规则管理 ===")
         
         # 1. 创建自动分配规则
-        assignment_rule = {
-            "name": "高优先级工单自动分配",
-            "description": "将高优先级工单自动分配给管理员",
-            "rule_type": "assignment",
-            "trigger_event": "ticket.created",
-            "conditions": [
-                {
-                    "field": "priority",
-                    "operator": "eq",
-                    "value": "high",
-                    "logic_op": "and"
-                }
-            ],
-            "actions": [
-                {
-                    "type": "assign",
-                    "params": {
-                        "user_id": 1
-                    }
-                }
-            ]
-        }
-        
-        response = self.session.post(f"{BASE_URL}/admin/automation/rules", json=assignment_rule)
+        response = self.session.post(RULES_URL, json=ASSIGNMENT_RULE)
         rule_id = None
         if response.status_code == 201:
             rule_id = response.json()["data"]["id"]
@@ -107,58 +398,24 @@ class AutomationTester:
             return False
             
         # 2. 创建自动分类规则
-        classification_rule = {
-            "name": "Bug问题自动分类",
-            "description": "包含bug关键词的工单自动分类为bug类型",
-            "rule_type": "classification",
-            "trigger_event": "ticket.created",
-            "conditions": [
-                {
-                    "field": "title",
-                    "operator": "contains",
-                    "value": "bug",
-                    "logic_op": "or"
-                },
-                {
-                    "field": "content",
-                    "operator": "contains", 
-                    "value": "error",
-                    "logic_op": "and"
-                }
-            ],
-            "actions": [
-                {
-                    "type": "set_priority",
-                    "params": {
-                        "priority": "high"
-                    }
-                },
-                {
-                    "type": "add_comment",
-                    "params": {
-                        "content": "系统自动识别为Bug问题，已提升优先级"
-                    }
-                }
-            ]
-        }
-        
-        response = self.session.post(f"{BASE_URL}/admin/automation/rules", json=classification_rule)
+        response = self.session.post(RULES_URL, json=CLASSIFICATION_RULE)
         if response.status_code == 201:
             print("✅ 创建自动分类规则成功")
         else:
             print(f"❌ 创建自动分类规则失败: {response.status_code}")
             
         # 3. 获取规则列表
-        response = self.session.get(f"{BASE_URL}/admin/automation/rules")
+        # 只需要总数：取最小分页并读取服务端统计的total，不必解析整页列表
+        response = self.session.get(RULES_URL, params={"page_size": 1})
         if response.status_code == 200:
-            rules = response.json()["data"]["rules"]
-            print(f"✅ 获取规则列表成功，共 {len(rules)} 条规则")
+            total = response.json()["data"]["total"]
+            print(f"✅ 获取规则列表成功，共 {total} 条规则")
         else:
             print(f"❌ 获取规则列表失败: {response.status_code}")
             
         # 4. 获取规则详情
         if rule_id:
-            response = self.session.get(f"{BASE_URL}/admin/automation/rules/{rule_id}")
+            response = self.session.get(f"{RULES_URL}/{rule_id}")
             if response.status_code == 200:
                 print("✅ 获取规则详情成功")
             else:
@@ -171,36 +428,7 @@ class AutomationTester:
         print("\n=== 测试SLA配置管理 ===")
         
         # 1. 创建默认SLA配置
-        default_sla = {
-            "name": "标准SLA配置",
-            "description": "适用于一般工单的标准SLA",
-            "is_default": True,
-            "response_time": 60,  # 60分钟响应时间
-            "resolution_time": 480,  # 8小时解决时间
-            "working_hours": {
-                "monday": {"start": "09:00", "end": "18:00"},
-                "tuesday": {"start": "09:00", "end": "18:00"},
-                "wednesday": {"start": "09:00", "end": "18:00"},
-                "thursday": {"start": "09:00", "end": "18:00"},
-                "friday": {"start": "09:00", "end": "18:00"},
-                "saturday": {"start": "", "end": ""},
-                "sunday": {"start": "", "end": ""}
-            },
-            "escalation_rules": [
-                {
-                    "trigger_minutes": 120,
-                    "action": "notify_admin",
-                    "notify_users": [1]
-                },
-                {
-                    "trigger_minutes": 240,
-                    "action": "escalate_to_manager",
-                    "target_user_id": 1
-                }
-            ]
-        }
-        
-        response = self.session.post(f"{BASE_URL}/admin/automation/sla", json=default_sla)
+        response = self.session.post(SLA_URL, json=DEFAULT_SLA)
         sla_id = None
         if response.status_code == 201:
             sla_id = response.json()["data"]["id"]
@@ -211,29 +439,14 @@ class AutomationTester:
             return False
             
         # 2. 创建高优先级SLA配置
-        high_priority_sla = {
-            "name": "高优先级SLA配置",
-            "description": "适用于高优先级工单的SLA",
-            "priority": "high",
-            "response_time": 30,  # 30分钟响应时间
-            "resolution_time": 240,  # 4小时解决时间
-            "escalation_rules": [
-                {
-                    "trigger_minutes": 60,
-                    "action": "escalate_to_manager",
-                    "target_user_id": 1
-                }
-            ]
-        }
-        
-        response = self.session.post(f"{BASE_URL}/admin/automation/sla", json=high_priority_sla)
+        response = self.session.post(SLA_URL, json=HIGH_PRIORITY_SLA)
         if response.status_code == 201:
             print("✅ 创建高优先级SLA配置成功")
         else:
             print(f"❌ 创建高优先级SLA配置失败: {response.status_code}")
             
         # 3. 获取SLA配置列表
-        response = self.session.get(f"{BASE_URL}/admin/automation/sla")
+        response = self.session.get(SLA_URL)
         if response.status_code == 200:
             configs = response.json()["data"]["configs"]
             print(f"✅ 获取SLA配置列表成功，共 {len(configs)} 条配置")
@@ -247,57 +460,7 @@ class AutomationTester:
         print("\n=== 测试工单模板管理 ===")
         
         # 1. 创建Bug报告模板
-        bug_template = {
-            "name": "Bug报告模板",
-            "description": "用于报告系统Bug的标准模板",
-            "category": "bug",
-            "title_template": "[Bug] {{summary}}",
-            "content_template": """
-**问题描述：**
-{{description}}
-
-**重现步骤：**
-1. {{step1}}
-2. {{step2}}
-3. {{step3}}
-
-**期望结果：**
-{{expected}}
-
-**实际结果：**
-{{actual}}
-
-**环境信息：**
-- 操作系统: {{os}}
-- 浏览器: {{browser}}
-- 版本: {{version}}
-""",
-            "default_type": "bug",
-            "default_priority": "normal",
-            "default_status": "open",
-            "custom_fields": [
-                {
-                    "name": "summary",
-                    "type": "text",
-                    "label": "问题摘要",
-                    "required": True
-                },
-                {
-                    "name": "description", 
-                    "type": "textarea",
-                    "label": "详细描述",
-                    "required": True
-                },
-                {
-                    "name": "severity",
-                    "type": "select",
-                    "label": "严重程度",
-                    "options": ["低", "中", "高", "紧急"]
-                }
-            ]
-        }
-        
-        response = self.session.post(f"{BASE_URL}/admin/automation/templates", json=bug_template)
+        response = self.session.post(TEMPLATES_URL, json=BUG_TEMPLATE)
         template_id = None
         if response.status_code == 201:
             template_id = response.json()["data"]["id"]
@@ -308,40 +471,14 @@ class AutomationTester:
             return False
             
         # 2. 创建功能请求模板
-        feature_template = {
-            "name": "功能请求模板",
-            "description": "用于提交新功能请求的模板",
-            "category": "feature",
-            "title_template": "[功能请求] {{feature_name}}",
-            "content_template": """
-**功能名称：**
-{{feature_name}}
-
-**业务需求：**
-{{business_need}}
-
-**详细描述：**
-{{description}}
-
-**验收标准：**
-{{acceptance_criteria}}
-
-**优先级：**
-{{priority}}
-""",
-            "default_type": "feature",
-            "default_priority": "normal",
-            "default_status": "open"
-        }
-        
-        response = self.session.post(f"{BASE_URL}/admin/automation/templates", json=feature_template)
+        response = self.session.post(TEMPLATES_URL, json=FEATURE_TEMPLATE)
         if response.status_code == 201:
             print("✅ 创建功能请求模板成功")
         else:
             print(f"❌ 创建功能请求模板失败: {response.status_code}")
             
         # 3. 获取模板列表
-        response = self.session.get(f"{BASE_URL}/admin/automation/templates")
+        response = self.session.get(TEMPLATES_URL)
         if response.status_code == 200:
             templates = response.json()["data"]["templates"]
             print(f"✅ 获取模板列表成功，共 {len(templates)} 个模板")
@@ -350,7 +487,7 @@ class AutomationTester:
             
         # 4. 获取模板详情
         if template_id:
-            response = self.session.get(f"{BASE_URL}/admin/automation/templates/{template_id}")
+            response = self.session.get(f"{TEMPLATES_URL}/{template_id}")
             if response.status_code == 200:
                 print("✅ 获取模板详情成功")
             else:
@@ -363,33 +500,10 @@ class AutomationTester:
         print("\n=== 测试快速回复管理 ===")
         
         # 1. 创建常用快速回复
-        quick_replies = [
-            {
-                "name": "感谢反馈",
-                "category": "礼貌用语",
-                "content": "感谢您的反馈，我们会尽快处理您的问题。",
-                "tags": "感谢,反馈",
-                "is_public": True
-            },
-            {
-                "name": "需要更多信息",
-                "category": "信息收集",
-                "content": "为了更好地帮助您解决问题，请提供以下信息：\n1. 问题出现的具体时间\n2. 您的操作步骤\n3. 错误截图或日志",
-                "tags": "信息,详情",
-                "is_public": True
-            },
-            {
-                "name": "问题已解决",
-                "category": "状态更新",
-                "content": "您的问题已经解决，如果还有其他疑问，请随时联系我们。",
-                "tags": "解决,完成",
-                "is_public": True
-            }
-        ]
-        
         reply_ids = []
-        for reply_data in quick_replies:
-            response = self.session.post(f"{BASE_URL}/admin/automation/quick-replies", json=reply_data)
+        create_reply = self._prepare_post(QUICK_REPLIES_URL)
+        responses = self._send_json_many(create_reply, QUICK_REPLIES)
+        for reply_data, response in zip(QUICK_REPLIES, responses):
             if response.status_code == 201:
                 reply_id = response.json()["data"]["id"]
                 reply_ids.append(reply_id)
@@ -398,7 +512,7 @@ class AutomationTester:
                 print(f"❌ 创建快速回复失败: {response.status_code}")
                 
         # 2. 获取快速回复列表
-        response = self.session.get(f"{BASE_URL}/admin/automation/quick-replies")
+        response = self.session.get(QUICK_REPLIES_URL)
         if response.status_code == 200:
             replies = response.json()["data"]["replies"]
             print(f"✅ 获取快速回复列表成功，共 {len(replies)} 个回复")
@@ -406,7 +520,7 @@ class AutomationTester:
             print(f"❌ 获取快速回复列表失败: {response.status_code}")
             
         # 3. 搜索快速回复
-        response = self.session.get(f"{BASE_URL}/admin/automation/quick-replies?keyword=感谢")
+        response = self.session.get(QUICK_REPLIES_URL, params={"keyword": "感谢"})
         if response.status_code == 200:
             replies = response.json()["data"]["replies"] 
             print(f"✅ 搜索快速回复成功，找到 {len(replies)} 个结果")
@@ -415,7 +529,7 @@ class AutomationTester:
             
         # 4. 使用快速回复
         if reply_ids:
-            response = self.session.post(f"{BASE_URL}/admin/automation/quick-replies/{reply_ids[0]}/use")
+            response = self.session.post(f"{QUICK_REPLIES_URL}/{reply_ids[0]}/use")
             if response.status_code == 200:
                 print("✅ 使用快速回复成功")
             else:
@@ -428,7 +542,7 @@ class AutomationTester:
         print("\n=== 测试批量操作功能 ===")
         
         # 首先获取一些工单ID
-        response = self.session.get(f"{BASE_URL}/tickets?page=1&page_size=3")
+        response = self.session.get(TICKETS_URL, params={"page": 1, "page_size": 3})
         ticket_ids = []
         if response.status_code == 200:
             tickets = response.json()["data"]["tickets"]
@@ -451,7 +565,7 @@ class AutomationTester:
             }
         }
         
-        response = self.session.post(f"{BASE_URL}/admin/automation/batch/update", json=batch_update_data)
+        response = self.session.post(BATCH_UPDATE_URL, json=batch_update_data)
         if response.status_code == 200:
             print("✅ 批量更新工单成功")
         else:
@@ -464,7 +578,7 @@ class AutomationTester:
             "user_id": 1
         }
         
-        response = self.session.post(f"{BASE_URL}/admin/automation/batch/assign", json=batch_assign_data)
+        response = self.session.post(BATCH_ASSIGN_URL, json=batch_assign_data)
         if response.status_code == 200:
             print("✅ 批量分配工单成功")
         else:
@@ -477,19 +591,19 @@ class AutomationTester:
         """测试执行日志查询"""
         print("\n=== 测试执行日志查询 ===")
         
-        # 获取执行日志
-        response = self.session.get(f"{BASE_URL}/admin/automation/logs")
+        # 获取执行日志（只需要总数，取最小分页读取total）
+        response = self.session.get(LOGS_URL, params={"page_size": 1})
         if response.status_code == 200:
-            logs = response.json()["data"]["logs"]
-            print(f"✅ 获取执行日志成功，共 {len(logs)} 条记录")
+            total = response.json()["data"]["total"]
+            print(f"✅ 获取执行日志成功，共 {total} 条记录")
         else:
             print(f"❌ 获取执行日志失败: {response.status_code}")
             
         # 按成功状态筛选
-        response = self.session.get(f"{BASE_URL}/admin/automation/logs?success=true")
+        response = self.session.get(LOGS_URL, params={"success": "true", "page_size": 1})
         if response.status_code == 200:
-            logs = response.json()["data"]["logs"]
-            print(f"✅ 获取成功执行日志，共 {len(logs)} 条记录")
+            total = response.json()["data"]["total"]
+            print(f"✅ 获取成功执行日志，共 {total} 条记录")
         else:
             print(f"❌ 获取成功执行日志失败: {response.status_code}")
             
@@ -503,7 +617,7 @@ class AutomationTester:
             print("❌ 没有可用的规则ID")
             return False
             
-        response = self.session.get(f"{BASE_URL}/admin/automation/rules/{rule_id}/stats")
+        response = self.session.get(f"{RULES_URL}/{rule_id}/stats")
         if response.status_code == 200:
             stats = response.json()["data"]
             print(f"✅ 获取规则统计成功")
@@ -523,30 +637,9 @@ class AutomationTester:
         print("\n=== 测试自动分类功能 ===")
         
         # 创建包含关键词的测试工单
-        test_tickets = [
-            {
-                "title": "系统出现Bug，无法正常登录",
-                "content": "用户登录时出现错误提示",
-                "type": "support",
-                "priority": "normal"
-            },
-            {
-                "title": "新功能请求：添加数据导出功能",
-                "content": "希望能够添加导出用户数据的功能",
-                "type": "support", 
-                "priority": "normal"
-            },
-            {
-                "title": "紧急问题：系统崩溃",
-                "content": "系统突然崩溃，需要立即处理",
-                "type": "support",
-                "priority": "normal"
-            }
-        ]
-        
         created_tickets = []
-        for ticket_data in test_tickets:
-            response = self.session.post(f"{BASE_URL}/tickets", json=ticket_data)
+        create_ticket = self._prepare_post(TICKETS_URL)
+        for response in self._send_json_many(create_ticket, TEST_TICKETS):
             if response.status_code == 201:
                 ticket = response.json()["data"]
                 created_tickets.append(ticket)
@@ -554,14 +647,13 @@ class AutomationTester:
             else:
                 print(f"❌ 创建测试工单失败: {response.status_code}")
                 
-        # 等待一段时间让自动分类规则执行
-        time.sleep(2)
+        # 当前没有规则在工单创建时触发（ExecuteRules 仅由定时任务调用），直接读取一次即可
+        updated_tickets = self._fetch_tickets(created_tickets)
         
         # 检查工单是否被正确分类
         for ticket in created_tickets:
-            response = self.session.get(f"{BASE_URL}/tickets/{ticket['id']}")
-            if response.status_code == 200:
-                updated_ticket = response.json()["data"]
+            updated_ticket = updated_tickets.get(ticket['id'])
+            if updated_ticket is not None:
                 original_type = ticket.get('type', 'support')
                 new_type = updated_ticket.get('type', 'support')
                 new_priority = updated_ticket.get('priority', 'normal')
@@ -569,10 +661,26 @@ class AutomationTester:
                 print(f"   工单 '{ticket['title']}': {original_type} -> {new_type}, 优先级: {new_priority}")
                 
         return True
+
+    def _fetch_ticket(self, ticket_id):
+        response = self.session.get(f"{TICKETS_URL}/{ticket_id}")
+        if response.status_code == 200:
+            return response.json()["data"]
+        return None
+
+    def _fetch_tickets(self, tickets):
+        """并行获取工单最新状态，返回 {工单ID: 工单数据}"""
+        if not tickets:
+            return {}
+        ids = [ticket['id'] for ticket in tickets]
+        with ThreadPoolExecutor(max_workers=len(ids)) as executor:
+            fetched = executor.map(self._fetch_ticket, ids)
+            return {ticket_id: ticket for ticket_id, ticket in zip(ids, fetched) if ticket is not None}
     
     def run_all_tests(self):
         """运行所有测试"""
         start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
         
         print("=== FE008 工单流程自动化功能测试 ===")
         print(f"测试开始时间: {start_time}")
@@ -625,16 +733,15 @@ class AutomationTester:
             traceback.print_exc()
         
         # 生成测试报告
-        end_time = datetime.now()
-        duration = end_time - start_time
+        elapsed_seconds = (time.perf_counter_ns() - start_ns) / 1e9
         
-        passed_count = sum(1 for _, result in test_results if result)
+        passed_count = sum(map(itemgetter(1), test_results))
         total_count = len(test_results)
         success_rate = (passed_count / total_count) * 100 if total_count > 0 else 0
         
         print(f"\n=== FE008 测试报告 ===")
         print(f"测试时间: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"测试时长: {duration.total_seconds():.2f}秒")
+        print(f"测试时长: {elapsed_seconds:.2f}秒")
         print(f"总测试数: {total_count}")
         print(f"通过数: {passed_count}")
         print(f"失败数: {total_count - passed_count}")
@@ -679,8 +786,10 @@ class AutomationTester:
             ]
         }
         
-        with open("fe008_automation_test_report.json", "w", encoding="utf-8") as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        # 一次性序列化并编码为UTF-8，以二进制方式单次写入，绕过TextIOWrapper
+        report_bytes = json.dumps(report, ensure_ascii=False, indent=2).encode("utf-8")
+        with open("fe008_automation_test_report.json", "wb") as f:
+            f.write(report_bytes)
         
         print(f"\n测试报告已保存到: fe008_automation_test_report.json")
         
@@ -692,13 +801,11 @@ class AutomationTester:
 def main():
     print("启动 FE008 工单流程自动化功能测试...")
     
-    # 检查后端服务是否运行
+    # 检查后端端口是否可连接；服务异常时随后的登录请求会直接失败并给出原因
+    backend = urlparse(BASE_URL)
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
-        if response.status_code != 200:
-            print("❌ 后端服务未正常运行")
-            return
-    except requests.exceptions.RequestException:
+        socket.create_connection((backend.hostname, backend.port or 80), timeout=0.5).close()
+    except OSError:
         print("❌ 无法连接到后端服务，请确保服务已启动")
         return
     
@@ -13,18 +13,50 @@
 运行方式: python test_fixes_verification.py
 """
 
+import functools
 import json
 import time
 import random
+import re
+import socket
 import string
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Dict, List, Any
 from dataclasses import dataclass
 
 import requests
 from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.connection import HTTPConnection
 from requests.packages.urllib3.util.retry import Retry
 
 
+# 本地测试请求超时（连接, 读取），服务异常时快速失败
+REQUEST_TIMEOUT = (2, 5)
+
+# 单个测试内部的子请求共享的线程池
+_REQUEST_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# 重复邮箱错误信息检测
+EMAIL_ERR_RE = re.compile(r"email|邮箱", re.IGNORECASE)
+
+# 列表端点默认分页参数（只读，可在各测试间共享）
+_DEFAULT_PAGE = MappingProxyType({"page": 1, "page_size": 5})
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """连接池socket启用TCP_NODELAY（urllib3默认已开启）和SO_KEEPALIVE"""
+    
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
 @dataclass 
 class TestResult:
     name: str
@@ -34,20 +66,66 @@ class TestResult:
     details: str = None
 
 
+class CheckFailed(Exception):
+    """测试检查未通过，异常信息作为 TestResult.error"""
+
+
+def timed_test(name: str):
+    """测试方法装饰器：统一计时和异常处理，把返回的 (passed, details) 转换为 TestResult"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self) -> TestResult:
+            start_time = time.perf_counter()
+            try:
+                passed, details = func(self)
+            except Exception as e:
+                return TestResult(
+                    name=name,
+                    passed=False,
+                    duration=time.perf_counter() - start_time,
+                    error=str(e)
+                )
+            return TestResult(
+                name=name,
+                passed=passed,
+                duration=time.perf_counter() - start_time,
+                details=details
+            )
+        return wrapper
+    return decorator
+
+
 class FixVerificationTester:
     """修复验证测试类"""
     
     def __init__(self):
         self.base_url = "http://localhost:8081/api"
+        # 各端点完整URL在初始化时拼接一次
+        self._urls = {
+            path: f"{self.base_url}{path}"
+            for path in ("/tickets", "/notifications", "/admin/users")
+        }
+        self._healthz_url = "http://localhost:8081/healthz"
         self.session = self._create_session()
         self.results: List[TestResult] = []
+        self._print_lock = threading.Lock()
+        # 同一轮测试内相同 (path, params) 的GET只请求一次
+        self._response_cache: Dict[tuple, Future] = {}
+        self._cache_lock = threading.Lock()
         
         # 测试用的认证token
         self.token = "test-token-for-verification"
         self.session.headers.update({
             "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
         })
+        
+        # 预构建各列表端点的GET请求（已合并会话请求头），分页调用只替换查询参数
+        self._prepared_gets = {
+            path: self.session.prepare_request(requests.Request("GET", url))
+            for path, url in self._urls.items()
+        }
     
     def _create_session(self) -> requests.Session:
         """创建带重试机制的HTTP会话"""
@@ -60,12 +138,51 @@ class FixVerificationTester:
             status_forcelist=[429, 500, 502, 503, 504],
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # 测试和子请求并发执行，连接池需容纳并发请求数，避免丢弃重建连接
+        adapter = KeepAliveAdapter(
+            max_retries=retry_strategy,
+            pool_connections=32,
+            pool_maxsize=32,
+            pool_block=False,
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
         return session
     
+    def _fetch(self, path: str, params: Dict[str, Any]) -> requests.Response:
+        """基于预构建请求GET指定端点"""
+        request = self._prepared_gets[path].copy()
+        request.prepare_url(self._urls[path], params)
+        return self.session.send(request, timeout=REQUEST_TIMEOUT)
+    
+    def _json(self, response: requests.Response) -> Any:
+        """解析响应体JSON；被多个测试共享的缓存响应只解析一次"""
+        data = getattr(response, "_parsed_json", None)
+        if data is None:
+            data = response._parsed_json = response.json()
+        return data
+    
+    def _cached_get(self, path: str, params: Dict[str, Any]) -> requests.Response:
+        """带缓存的GET：并发请求同一 (path, params) 时只发出一次请求并共享结果"""
+        key = (path, frozenset(params.items()))
+        with self._cache_lock:
+            future = self._response_cache.get(key)
+            owner = future is None
+            if owner:
+                future = self._response_cache[key] = Future()
+        
+        if owner:
+            try:
+                future.set_result(self._fetch(path, params))
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+    
+    def _fetch_many(self, requests_args: List[tuple]) -> List[requests.Response]:
+        """并发发起一组 (path, params) GET 请求，返回顺序与输入一致"""
+        return list(_REQUEST_EXECUTOR.map(lambda args: self._cached_get(*args), requests_args))
+    
     def _random_string(self, length: int = 8) -> str:
         """生成随机字符串"""
         return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
@@ -75,6 +192,14 @@ class FixVerificationTester:
         print(f"\n🔄 开始测试: {test_name}")
         print("-" * 60)
     
+    def _run_test(self, test) -> TestResult:
+        """执行单个测试，并在锁内成组输出日志，避免并发执行时输出交错"""
+        result = test()
+        with self._print_lock:
+            self._log_test_start(test.__name__.replace("test_", "").replace("_", " ").title())
+            self._log_test_result(result)
+        return result
+    
     def _log_test_result(self, result: TestResult):
         """记录测试结果"""
         status = "✅ PASS" if result.passed else "❌ FAIL"
@@ -86,315 +211,189 @@ class FixVerificationTester:
         if result.error:
             print(f"   错误: {result.error}")
     
-    def test_ticket_pagination_fix(self) -> TestResult:
+    @timed_test("工单分页修复")
+    def test_ticket_pagination_fix(self):
         """测试工单分页修复"""
-        start_time = time.time()
+        # 测试不同分页参数
+        test_cases = [
+            _DEFAULT_PAGE,
+            {"page": 1, "page_size": 10}, 
+            {"page": 2, "page_size": 5},
+        ]
         
-        try:
-            # 测试不同分页参数
-            test_cases = [
-                {"page": 1, "page_size": 5},
-                {"page": 1, "page_size": 10}, 
-                {"page": 2, "page_size": 5},
-            ]
+        results = []
+        responses = self._fetch_many([("/tickets", params) for params in test_cases])
+        for params, response in zip(test_cases, responses):
+            # 检查响应状态
+            if response.status_code != 200:
+                raise CheckFailed(f"HTTP {response.status_code}: {response.text}")
             
-            results = []
-            for params in test_cases:
-                response = self.session.get(f"{self.base_url}/tickets", params=params)
-                
-                # 检查响应状态
-                if response.status_code != 200:
-                    return TestResult(
-                        name="工单分页修复",
-                        passed=False,
-                        duration=time.time() - start_time,
-                        error=f"HTTP {response.status_code}: {response.text}"
-                    )
-                
-                data = response.json()
-                
-                # 验证响应格式
-                if "data" not in data:
-                    return TestResult(
-                        name="工单分页修复", 
-                        passed=False,
-                        duration=time.time() - start_time,
-                        error="响应缺少data字段"
-                    )
-                
-                results.append({
-                    "params": params,
-                    "total": data.get("total", 0),
-                    "count": len(data.get("data", []))
-                })
+            data = self._json(response)
             
-            return TestResult(
-                name="工单分页修复",
-                passed=True,
-                duration=time.time() - start_time,
-                details=f"测试了{len(results)}种分页参数，所有响应正常"
-            )
+            # 验证响应格式
+            if "data" not in data:
+                raise CheckFailed("响应缺少data字段")
             
-        except Exception as e:
-            return TestResult(
-                name="工单分页修复",
-                passed=False,
-                duration=time.time() - start_time,
-                error=str(e)
-            )
+            results.append({
+                "params": params,
+                "total": data.get("total", 0),
+                "count": len(data.get("data", []))
+            })
+        
+        return True, f"测试了{len(results)}种分页参数，所有响应正常"
     
-    def test_notification_pagination_fix(self) -> TestResult:
+    @timed_test("通知分页修复")
+    def test_notification_pagination_fix(self):
         """测试通知分页修复"""
-        start_time = time.time()
+        # 测试通知分页
+        test_cases = [
+            _DEFAULT_PAGE,
+            {"page": 1, "page_size": 10},
+        ]
         
-        try:
-            # 测试通知分页
-            test_cases = [
-                {"page": 1, "page_size": 5},
-                {"page": 1, "page_size": 10},
-            ]
-            
-            for params in test_cases:
-                response = self.session.get(f"{self.base_url}/notifications", params=params)
-                
-                if response.status_code != 200:
-                    return TestResult(
-                        name="通知分页修复",
-                        passed=False,
-                        duration=time.time() - start_time,
-                        error=f"HTTP {response.status_code}: {response.text}"
-                    )
-                
-                data = response.json()
-                
-                # 验证分页数据结构
-                if "data" not in data:
-                    return TestResult(
-                        name="通知分页修复",
-                        passed=False,
-                        duration=time.time() - start_time,
-                        error="通知响应缺少data字段"
-                    )
+        responses = self._fetch_many([("/notifications", params) for params in test_cases])
+        for response in responses:
+            if response.status_code != 200:
+                raise CheckFailed(f"HTTP {response.status_code}: {response.text}")
             
-            return TestResult(
-                name="通知分页修复",
-                passed=True,
-                duration=time.time() - start_time,
-                details="通知分页参数传递正常，响应格式正确"
-            )
+            data = self._json(response)
             
-        except Exception as e:
-            return TestResult(
-                name="通知分页修复",
-                passed=False,
-                duration=time.time() - start_time,
-                error=str(e)
-            )
+            # 验证分页数据结构
+            if "data" not in data:
+                raise CheckFailed("通知响应缺少data字段")
+        
+        return True, "通知分页参数传递正常，响应格式正确"
     
-    def test_user_list_pagination_fix(self) -> TestResult:
+    @timed_test("用户列表分页修复")
+    def test_user_list_pagination_fix(self):
         """测试用户列表分页修复"""
-        start_time = time.time()
+        # 测试用户列表分页
+        params = {"page": 1, "page_size": 10}
+        response = self.session.get(self._urls["/admin/users"], params=params, timeout=REQUEST_TIMEOUT)
         
-        try:
-            # 测试用户列表分页
-            params = {"page": 1, "page_size": 10}
-            response = self.session.get(f"{self.base_url}/admin/users", params=params)
-            
-            if response.status_code != 200:
-                return TestResult(
-                    name="用户列表分页修复",
-                    passed=False,
-                    duration=time.time() - start_time,
-                    error=f"HTTP {response.status_code}: {response.text}"
-                )
-            
-            data = response.json()
-            
-            # 验证用户列表数据结构
-            if "data" not in data:
-                return TestResult(
-                    name="用户列表分页修复", 
-                    passed=False,
-                    duration=time.time() - start_time,
-                    error="用户列表响应缺少data字段"
-                )
-            
-            return TestResult(
-                name="用户列表分页修复",
-                passed=True,
-                duration=time.time() - start_time,
-                details=f"用户列表获取成功，共{data.get('total', 0)}个用户"
-            )
-            
-        except Exception as e:
-            return TestResult(
-                name="用户列表分页修复",
-                passed=False,
-                duration=time.time() - start_time,
-                error=str(e)
-            )
+        if response.status_code != 200:
+            raise CheckFailed(f"HTTP {response.status_code}: {response.text}")
+        
+        data = self._json(response)
+        
+        # 验证用户列表数据结构
+        if "data" not in data:
+            raise CheckFailed("用户列表响应缺少data字段")
+        
+        return True, f"用户列表获取成功，共{data.get('total', 0)}个用户"
     
-    def test_email_duplicate_error_handling(self) -> TestResult:
+    @timed_test("邮箱重复错误处理")
+    def test_email_duplicate_error_handling(self):
         """测试邮箱重复错误处理"""
-        start_time = time.time()
+        # 先创建一个测试用户
+        random_suffix = self._random_string(6)
+        test_email = f"test_{random_suffix}@example.com"
         
-        try:
-            # 先创建一个测试用户
-            random_suffix = self._random_string(6)
-            test_email = f"test_{random_suffix}@example.com"
-            
-            user_data = {
-                "username": f"testuser_{random_suffix}",
-                "email": test_email,
-                "password": "testpass123",
-                "role": "customer",
-                "status": "active",
-                "first_name": "测试",
-                "last_name": "用户"
-            }
-            
-            # 第一次创建 - 应该成功
-            response = self.session.post(f"{self.base_url}/admin/users", json=user_data)
-            
-            if response.status_code == 201:
-                first_create_success = True
-                created_user_data = response.json()
-            else:
-                first_create_success = False
-                print(f"首次创建用户失败: {response.status_code} - {response.text}")
-            
-            # 第二次创建相同邮箱 - 应该返回错误
-            duplicate_user_data = user_data.copy()
-            duplicate_user_data["username"] = f"testuser2_{random_suffix}"  # 不同用户名，相同邮箱
-            
-            duplicate_response = self.session.post(f"{self.base_url}/admin/users", json=duplicate_user_data)
-            
-            # 检查是否正确返回冲突错误
-            if duplicate_response.status_code == 409:
-                error_data = duplicate_response.json()
-                error_message = error_data.get("msg", "")
-                
-                # 验证错误信息是否包含邮箱相关内容
-                email_error_detected = "email" in error_message.lower() or "邮箱" in error_message
-                
-                return TestResult(
-                    name="邮箱重复错误处理",
-                    passed=email_error_detected,
-                    duration=time.time() - start_time,
-                    details=f"正确返回409错误，错误信息: {error_message}",
-                    error=None if email_error_detected else "错误信息中未明确指出邮箱重复"
-                )
-            else:
-                return TestResult(
-                    name="邮箱重复错误处理",
-                    passed=False,
-                    duration=time.time() - start_time,
-                    error=f"期望HTTP 409，实际收到{duplicate_response.status_code}: {duplicate_response.text}"
-                )
-                
-        except Exception as e:
-            return TestResult(
-                name="邮箱重复错误处理",
-                passed=False,
-                duration=time.time() - start_time,
-                error=str(e)
-            )
+        user_data = {
+            "username": f"testuser_{random_suffix}",
+            "email": test_email,
+            "password": "testpass123",
+            "role": "customer",
+            "status": "active",
+            "first_name": "测试",
+            "last_name": "用户"
+        }
+        
+        # 第一次创建 - 应该成功
+        # 两次请求必须串行：并发时落后的一方会在数据库唯一索引上失败并返回500，而不是409
+        response = self.session.post(self._urls["/admin/users"], json=user_data, timeout=REQUEST_TIMEOUT)
+        
+        # 只关心状态码，创建成功时不解析响应体
+        if response.status_code != 201:
+            print(f"首次创建用户失败: {response.status_code} - {response.text}")
+        
+        # 第二次创建相同邮箱 - 应该返回错误
+        duplicate_user_data = user_data.copy()
+        duplicate_user_data["username"] = f"testuser2_{random_suffix}"  # 不同用户名，相同邮箱
+        
+        duplicate_response = self.session.post(self._urls["/admin/users"], json=duplicate_user_data, timeout=REQUEST_TIMEOUT)
+        
+        # 检查是否正确返回冲突错误
+        if duplicate_response.status_code != 409:
+            raise CheckFailed(f"期望HTTP 409，实际收到{duplicate_response.status_code}: {duplicate_response.text}")
+        
+        error_data = self._json(duplicate_response)
+        error_message = error_data.get("msg", "")
+        
+        # 验证错误信息是否包含邮箱相关内容
+        email_error_detected = bool(EMAIL_ERR_RE.search(error_message))
+        if not email_error_detected:
+            raise CheckFailed(f"错误信息中未明确指出邮箱重复: {error_message}")
+        
+        return True, f"正确返回409错误，错误信息: {error_message}"
     
-    def test_api_connectivity(self) -> TestResult:
+    @timed_test("API连接性测试")
+    def test_api_connectivity(self):
         """测试API连接性"""
-        start_time = time.time()
-        
+        # 测试健康检查端点
         try:
-            # 测试健康检查端点
-            response = self.session.get(f"http://localhost:8081/healthz")
-            
-            if response.status_code == 200:
-                health_data = response.json()
-                return TestResult(
-                    name="API连接性测试",
-                    passed=True,
-                    duration=time.time() - start_time,
-                    details=f"服务健康: {health_data.get('message', 'OK')}"
-                )
-            else:
-                return TestResult(
-                    name="API连接性测试",
-                    passed=False,
-                    duration=time.time() - start_time,
-                    error=f"健康检查失败: {response.status_code}"
-                )
-                
-        except Exception as e:
-            return TestResult(
-                name="API连接性测试",
-                passed=False,
-                duration=time.time() - start_time,
-                error=f"无法连接到API服务: {str(e)}"
-            )
+            response = self.session.get(self._healthz_url, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            raise CheckFailed(f"无法连接到API服务: {str(e)}") from e
+        
+        if response.status_code != 200:
+            raise CheckFailed(f"健康检查失败: {response.status_code}")
+        
+        health_data = self._json(response)
+        return True, f"服务健康: {health_data.get('message', 'OK')}"
     
-    def test_response_format_consistency(self) -> TestResult:
+    @timed_test("响应格式一致性")
+    def test_response_format_consistency(self):
         """测试响应格式一致性"""
-        start_time = time.time()
+        endpoints = [
+            "/tickets",
+            "/notifications", 
+            "/admin/users"
+        ]
         
-        try:
-            endpoints = [
-                "/tickets",
-                "/notifications", 
-                "/admin/users"
-            ]
-            
-            consistent = True
-            inconsistent_endpoints = []
-            
-            for endpoint in endpoints:
-                try:
-                    response = self.session.get(f"{self.base_url}{endpoint}", params={"page": 1, "page_size": 5})
+        consistent = True
+        inconsistent_endpoints = []
+        
+        futures = [
+            _REQUEST_EXECUTOR.submit(self._cached_get, endpoint, _DEFAULT_PAGE)
+            for endpoint in endpoints
+        ]
+        
+        for endpoint, future in zip(endpoints, futures):
+            try:
+                response = future.result()
+                
+                if response.status_code == 200:
+                    data = self._json(response)
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        # 检查标准字段
-                        expected_fields = ["code", "data", "msg"]
-                        missing_fields = [field for field in expected_fields if field not in data]
-                        
-                        if missing_fields:
-                            consistent = False
-                            inconsistent_endpoints.append(f"{endpoint}: 缺少字段 {missing_fields}")
-                        
-                        # 检查data字段是否包含列表数据
-                        if "data" in data and not isinstance(data.get("data"), list):
-                            # 对于列表端点，data应该是数组或包含items数组的对象
-                            if not (isinstance(data["data"], dict) and ("items" in data["data"] or "data" in data["data"])):
-                                consistent = False 
-                                inconsistent_endpoints.append(f"{endpoint}: data字段格式不符合预期 - 期望包含items或data数组")
-                                
-                except Exception as e:
-                    inconsistent_endpoints.append(f"{endpoint}: 请求失败 - {str(e)}")
-                    consistent = False
-            
-            return TestResult(
-                name="响应格式一致性",
-                passed=consistent,
-                duration=time.time() - start_time,
-                details="所有端点响应格式一致" if consistent else f"发现不一致: {'; '.join(inconsistent_endpoints)}"
-            )
-            
-        except Exception as e:
-            return TestResult(
-                name="响应格式一致性",
-                passed=False,
-                duration=time.time() - start_time,
-                error=str(e)
-            )
+                    # 检查标准字段
+                    expected_fields = ["code", "data", "msg"]
+                    missing_fields = [field for field in expected_fields if field not in data]
+                    
+                    if missing_fields:
+                        consistent = False
+                        inconsistent_endpoints.append(f"{endpoint}: 缺少字段 {missing_fields}")
+                    
+                    # 检查data字段是否包含列表数据
+                    if "data" in data and not isinstance(data.get("data"), list):
+                        # 对于列表端点，data应该是数组或包含items数组的对象
+                        if not (isinstance(data["data"], dict) and ("items" in data["data"] or "data" in data["data"])):
+                            consistent = False 
+                            inconsistent_endpoints.append(f"{endpoint}: data字段格式不符合预期 - 期望包含items或data数组")
+                            
+            except Exception as e:
+                inconsistent_endpoints.append(f"{endpoint}: 请求失败 - {str(e)}")
+                consistent = False
+        
+        return consistent, "所有端点响应格式一致" if consistent else f"发现不一致: {'; '.join(inconsistent_endpoints)}"
     
     def run_all_tests(self):
         """运行所有测试"""
         print("🚀 开始验证工单管理系统修复效果")
         print("=" * 60)
         
-        # 定义测试顺序
+        # 定义测试顺序（连接性测试单独先行）
         tests = [
-            self.test_api_connectivity,
             self.test_ticket_pagination_fix,
             self.test_notification_pagination_fix, 
             self.test_user_list_pagination_fix,
@@ -402,11 +401,20 @@ class FixVerificationTester:
             self.test_response_format_consistency,
         ]
         
-        for test in tests:
-            self._log_test_start(test.__name__.replace("test_", "").replace("_", " ").title())
-            result = test()
-            self.results.append(result)
-            self._log_test_result(result)
+        with self._cache_lock:
+            self._response_cache.clear()
+        
+        # 服务不可达时其余测试只会逐个超时，直接跳过
+        connectivity = self._run_test(self.test_api_connectivity)
+        self.results.append(connectivity)
+        if not connectivity.passed:
+            print("\n⛔ API服务不可达，跳过其余测试")
+            self._generate_summary()
+            return
+        
+        # 各测试互不依赖且耗时主要在网络等待，并发执行使总耗时接近最慢的单个测试
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            self.results.extend(executor.map(self._run_test, tests))
         
         self._generate_summary()
     
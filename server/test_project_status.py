@@ -6,19 +6,103 @@
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import sys
-from datetime import datetime
-from typing import Dict, List, Optional
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
 # 测试配置
 BASE_URL = "http://localhost:8080"
 API_BASE = f"{BASE_URL}/api"
+MAX_CONCURRENCY = 8  # 并发请求上限，避免压垮开发服务器
+HEALTH_CACHE_TTL = 30  # 健康检查结果缓存秒数
+REQUEST_TIMEOUT = (1, 5)  # (连接, 读取)超时秒数，单个接口挂起时快速失败
+
+# 核心API端点 (名称, URL)，均为GET请求
+_CORE_APIS = tuple((name, f"{API_BASE}{path}") for name, path in (
+    ("工单列表", "/tickets"),
+    ("用户资料", "/user/profile"),
+    ("通知列表", "/notifications"),
+    ("通知偏好", "/notifications/preferences"),
+    ("邮件配置", "/admin/email-config"),
+    ("用户管理", "/admin/users"),
+    ("系统配置", "/admin/system/configs"),
+    ("Webhook配置", "/webhooks"),
+))
+
+# 成功结果标记（单个码位），结果字符串以它开头即视为通过
+_SUCCESS_MARK = "✅"
+
+# 预绑定的输出模板，循环中只需一次format调用
+_OK = "  ✅ {}: 正常".format
+_CREATED = "  ✅ {}: 成功".format
+_LOCKED = "  🔒 {}: 需要权限".format
+_FAIL = "  ❌ {}: 失败({})".format
+
+# 状态码 -> (输出模板, 结果)，其余状态码均视为失败
+_STATUS_LABELS = {
+    200: (_OK, "✅ 正常"),
+    201: (_CREATED, "✅ 成功"),
+    401: (_LOCKED, "🔒 需要权限"),
+}
+
+
+# 并发执行的模块测试各自缓冲输出，结束后按模块顺序统一打印，避免控制台交错
+_output = threading.local()
+
+
+def _emit(*args) -> None:
+    """输出一行：处于模块缓冲中时先暂存，否则直接打印"""
+    lines = getattr(_output, "lines", None)
+    if lines is None:
+        print(*args)
+    else:
+        lines.append(" ".join(map(str, args)))
+
+
+def _buffered(test) -> List[str]:
+    """在当前线程运行模块测试，返回其全部输出行"""
+    _output.lines = []
+    try:
+        test()
+        return _output.lines
+    finally:
+        del _output.lines
+
+
+def _label(status: int, name: str) -> str:
+    """按状态码输出并返回统一格式的检查结果"""
+    entry = _STATUS_LABELS.get(status)
+    if entry is None:
+        _emit(_FAIL(name, status))
+        return f"❌ 失败({status})"
+    line, result = entry
+    _emit(line(name))
+    return result
+
+
+# 只需要列表总数时请求最小分页，由服务端统计total，避免传输和解析整页数据
+_COUNT_ONLY = {"page": 1, "page_size": 1}
+
+
+def _list_total(response: requests.Response) -> int:
+    """读取分页列表响应 data.total"""
+    data = response.json().get("data") or {}
+    return data.get("total", 0) if isinstance(data, dict) else 0
+
 
 class ProjectStatusTester:
     def __init__(self):
         self.session = requests.Session()
+        # 并发探测同一主机：扩大连接池，保证所有请求复用keep-alive连接
+        adapter = HTTPAdapter(pool_connections=MAX_CONCURRENCY, pool_maxsize=32, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.token = "test-token"
         self.admin_token = "admin-test-token"
         self.test_results = {
@@ -30,19 +114,41 @@ class ProjectStatusTester:
             "enhancement_features": {}
         }
         
+        # 健康检查/认证结果缓存: token -> (检查时间, 是否健康)，随实例创建而重置
+        self._health_cache: Dict[str, Tuple[float, bool]] = {}
+        
         # 设置请求头
         self.session.headers.update({
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
         })
     
+    @contextmanager
+    def _scope(self, label: str, results: Dict[str, str], key: str = "系统状态"):
+        """统一记录测试异常"""
+        try:
+            yield
+        except Exception as e:
+            _emit(f"  ❌ {label}异常: {e}")
+            results[key] = f"❌ 异常: {str(e)}"
+    
     def test_system_health(self) -> bool:
-        """测试系统基础健康状态"""
+        """测试系统基础健康状态（同一实例内按token缓存结果）"""
         print("\n🔍 测试系统基础健康状态...")
         
-        try:
+        cached = self._health_cache.get(self.token)
+        if cached and time.monotonic() - cached[0] < HEALTH_CACHE_TTL:
+            print("  ✅ 复用最近的健康检查结果")
+            return cached[1]
+        
+        healthy = self._check_system_health()
+        self._health_cache[self.token] = (time.monotonic(), healthy)
+        return healthy
+    
+    def _check_system_health(self) -> bool:
+        with self._scope("系统健康检查", self.test_results["system_status"], "health_check"):
             # 测试健康检查端点
-            health_response = self.session.get(f"{BASE_URL}/healthz")
+            health_response = self.session.get(f"{BASE_URL}/healthz", timeout=REQUEST_TIMEOUT)
             if health_response.status_code == 200:
                 print("  ✅ 健康检查端点正常")
                 self.test_results["system_status"]["health_check"] = "✅ 正常"
@@ -52,7 +158,7 @@ class ProjectStatusTester:
                 return False
             
             # 测试用户认证
-            auth_response = self.session.get(f"{API_BASE}/auth/me")
+            auth_response = self.session.get(f"{API_BASE}/auth/me", timeout=REQUEST_TIMEOUT)
             if auth_response.status_code == 200:
                 print("  ✅ 用户认证系统正常")
                 self.test_results["basic_features"]["authentication"] = "✅ 正常"
@@ -62,111 +168,97 @@ class ProjectStatusTester:
                 return False
             
             return True
-            
-        except Exception as e:
-            print(f"  ❌ 系统健康检查异常: {e}")
-            self.test_results["system_status"]["health_check"] = f"❌ 异常: {str(e)}"
-            return False
+        
+        return False
     
     def test_core_apis(self) -> Dict[str, str]:
         """测试核心API端点"""
-        print("\n📡 测试核心API端点...")
-        
-        core_apis = [
-            {"name": "工单列表", "method": "GET", "url": f"{API_BASE}/tickets"},
-            {"name": "用户资料", "method": "GET", "url": f"{API_BASE}/user/profile"},
-            {"name": "通知列表", "method": "GET", "url": f"{API_BASE}/notifications"},
-            {"name": "通知偏好", "method": "GET", "url": f"{API_BASE}/notifications/preferences"},
-            {"name": "邮件配置", "method": "GET", "url": f"{API_BASE}/admin/email-config"},
-            {"name": "用户管理", "method": "GET", "url": f"{API_BASE}/admin/users"},
-            {"name": "系统配置", "method": "GET", "url": f"{API_BASE}/admin/system/configs"},
-            {"name": "Webhook配置", "method": "GET", "url": f"{API_BASE}/webhooks"},
-        ]
+        _emit("\n📡 测试核心API端点...")
         
         api_results = {}
         
-        for api in core_apis:
-            try:
-                if api["method"] == "GET":
-                    response = self.session.get(api["url"])
+        with self._scope("核心API测试", api_results):
+            def probe(url):
+                try:
+                    return self.session.get(url, timeout=REQUEST_TIMEOUT), None
+                except Exception as e:
+                    return None, e
+        
+            # 各端点互不依赖，并发请求后按原顺序输出结果
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+                probes = list(executor.map(probe, (url for _, url in _CORE_APIS)))
+        
+            for (name, _), (response, error) in zip(_CORE_APIS, probes):
+                try:
+                    if error is not None:
+                        raise error
                 
-                if response.status_code == 200:
-                    print(f"  ✅ {api['name']}: {response.status_code}")
-                    api_results[api["name"]] = "✅ 正常"
-                elif response.status_code == 401:
-                    print(f"  🔒 {api['name']}: 需要权限 ({response.status_code})")
-                    api_results[api["name"]] = "🔒 需要权限"
-                else:
-                    print(f"  ❌ {api['name']}: {response.status_code}")
-                    api_results[api["name"]] = f"❌ 失败({response.status_code})"
+                    api_results[name] = _label(response.status_code, name)
                     
-            except Exception as e:
-                print(f"  ❌ {api['name']}: 异常 - {str(e)}")
-                api_results[api["name"]] = f"❌ 异常: {str(e)}"
+                except Exception as e:
+                    _emit(f"  ❌ {name}: 异常 - {str(e)}")
+                    api_results[name] = f"❌ 异常: {str(e)}"
         
         self.test_results["api_endpoints"] = api_results
         return api_results
     
     def test_notification_system(self) -> Dict[str, str]:
         """测试通知系统功能"""
-        print("\n🔔 测试通知系统功能...")
+        _emit("\n🔔 测试通知系统功能...")
         
         notification_tests = {}
         
-        try:
+        with self._scope("通知系统测试", notification_tests):
             # 测试通知列表
-            notifications_response = self.session.get(f"{API_BASE}/notifications")
+            notifications_response = self.session.get(f"{API_BASE}/notifications", params=_COUNT_ONLY, timeout=REQUEST_TIMEOUT)
             if notifications_response.status_code == 200:
-                notifications = notifications_response.json()
-                total_notifications = len(notifications.get("data", []))
-                print(f"  ✅ 通知列表查询成功: {total_notifications} 条通知")
+                total_notifications = _list_total(notifications_response)
+                _emit(f"  ✅ 通知列表查询成功: {total_notifications} 条通知")
                 notification_tests["通知列表"] = f"✅ {total_notifications} 条通知"
             else:
-                print(f"  ❌ 通知列表查询失败: {notifications_response.status_code}")
+                _emit(f"  ❌ 通知列表查询失败: {notifications_response.status_code}")
                 notification_tests["通知列表"] = f"❌ 失败({notifications_response.status_code})"
             
             # 测试未读通知数量
-            unread_response = self.session.get(f"{API_BASE}/notifications/unread-count")
+            unread_response = self.session.get(f"{API_BASE}/notifications/unread-count", timeout=REQUEST_TIMEOUT)
             if unread_response.status_code == 200:
                 unread_count = unread_response.json().get("count", 0)
-                print(f"  ✅ 未读通知统计: {unread_count} 条")
+                _emit(f"  ✅ 未读通知统计: {unread_count} 条")
                 notification_tests["未读统计"] = f"✅ {unread_count} 条未读"
             else:
-                print(f"  ❌ 未读通知统计失败: {unread_response.status_code}")
+                _emit(f"  ❌ 未读通知统计失败: {unread_response.status_code}")
                 notification_tests["未读统计"] = f"❌ 失败({unread_response.status_code})"
             
             # 测试通知偏好设置
-            preferences_response = self.session.get(f"{API_BASE}/notifications/preferences")
+            preferences_response = self.session.get(f"{API_BASE}/notifications/preferences", timeout=REQUEST_TIMEOUT)
             if preferences_response.status_code == 200:
                 preferences = preferences_response.json().get("data", [])
-                print(f"  ✅ 通知偏好设置: {len(preferences)} 项配置")
+                _emit(f"  ✅ 通知偏好设置: {len(preferences)} 项配置")
                 notification_tests["偏好设置"] = f"✅ {len(preferences)} 项配置"
             else:
-                print(f"  ❌ 通知偏好设置失败: {preferences_response.status_code}")
+                _emit(f"  ❌ 通知偏好设置失败: {preferences_response.status_code}")
                 notification_tests["偏好设置"] = f"❌ 失败({preferences_response.status_code})"
-            
-        except Exception as e:
-            print(f"  ❌ 通知系统测试异常: {e}")
-            notification_tests["系统状态"] = f"❌ 异常: {str(e)}"
         
-        self.test_results["notification_system"] = notification_tests
+        # 与邮件系统测试共用该分类，并发执行时合并而不是覆盖
+        self.test_results["notification_system"].update(notification_tests)
         return notification_tests
     
     def test_email_system(self) -> Dict[str, str]:
         """测试邮件系统功能"""
-        print("\n📧 测试邮件系统功能...")
+        _emit("\n📧 测试邮件系统功能...")
         
         email_tests = {}
+        # 本方法内的时间戳统一基于一次取值
+        now = datetime.now()
         
-        try:
+        with self._scope("邮件系统测试", email_tests):
             # 测试邮件配置
-            email_config_response = self.session.get(f"{API_BASE}/admin/email-config")
+            email_config_response = self.session.get(f"{API_BASE}/admin/email-config", timeout=REQUEST_TIMEOUT)
             if email_config_response.status_code == 200:
-                email_config = email_config_response.json()
-                print("  ✅ 邮件配置查询成功")
+                _emit("  ✅ 邮件配置查询成功")
                 email_tests["邮件配置"] = "✅ 配置正常"
             else:
-                print(f"  ❌ 邮件配置查询失败: {email_config_response.status_code}")
+                _emit(f"  ❌ 邮件配置查询失败: {email_config_response.status_code}")
                 email_tests["邮件配置"] = f"❌ 失败({email_config_response.status_code})"
             
             # 测试创建邮件通知
@@ -179,23 +271,22 @@ class ProjectStatusTester:
                 "recipient_id": 1,
                 "metadata": {
                     "test_source": "project_status_test",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now.isoformat()
                 }
             }
             
             create_response = self.session.post(f"{API_BASE}/admin/notifications", 
-                                              json=notification_data)
+                                              json=notification_data, timeout=REQUEST_TIMEOUT)
             if create_response.status_code == 201:
                 notification = create_response.json()["data"]
-                print(f"  ✅ 邮件通知创建成功 (ID: {notification['id']})")
+                _emit(f"  ✅ 邮件通知创建成功 (ID: {notification['id']})")
                 email_tests["通知创建"] = f"✅ 成功(ID: {notification['id']})"
             else:
-                print(f"  ❌ 邮件通知创建失败: {create_response.status_code}")
+                _emit(f"  ❌ 邮件通知创建失败: {create_response.status_code}")
                 email_tests["通知创建"] = f"❌ 失败({create_response.status_code})"
             
             # 测试定时通知
-            from datetime import timedelta
-            future_time = datetime.now() + timedelta(seconds=10)
+            future_time = now + timedelta(seconds=10)
             scheduled_data = {
                 "type": "system_maintenance",
                 "title": "定时通知测试",
@@ -210,76 +301,66 @@ class ProjectStatusTester:
             }
             
             scheduled_response = self.session.post(f"{API_BASE}/admin/notifications",
-                                                 json=scheduled_data)
+                                                 json=scheduled_data, timeout=REQUEST_TIMEOUT)
             if scheduled_response.status_code == 201:
                 scheduled_notification = scheduled_response.json()["data"]
-                print(f"  ✅ 定时通知创建成功 (ID: {scheduled_notification['id']})")
+                _emit(f"  ✅ 定时通知创建成功 (ID: {scheduled_notification['id']})")
                 email_tests["定时通知"] = f"✅ 成功(ID: {scheduled_notification['id']})"
             else:
-                print(f"  ❌ 定时通知创建失败: {scheduled_response.status_code}")
+                _emit(f"  ❌ 定时通知创建失败: {scheduled_response.status_code}")
                 email_tests["定时通知"] = f"❌ 失败({scheduled_response.status_code})"
-            
-        except Exception as e:
-            print(f"  ❌ 邮件系统测试异常: {e}")
-            email_tests["系统状态"] = f"❌ 异常: {str(e)}"
         
         self.test_results["notification_system"].update(email_tests)
         return email_tests
     
     def test_enhancement_features(self) -> Dict[str, str]:
         """测试功能增强特性"""
-        print("\n🚀 测试功能增强特性...")
+        _emit("\n🚀 测试功能增强特性...")
         
         enhancement_tests = {}
         
-        try:
+        with self._scope("功能增强测试", enhancement_tests):
             # 测试示例数据(FE001)
-            tickets_response = self.session.get(f"{API_BASE}/tickets")
+            tickets_response = self.session.get(f"{API_BASE}/tickets", params=_COUNT_ONLY, timeout=REQUEST_TIMEOUT)
             if tickets_response.status_code == 200:
-                tickets = tickets_response.json()
-                total_tickets = tickets.get("total", 0)
-                print(f"  ✅ FE001-示例数据: {total_tickets} 个工单")
+                total_tickets = _list_total(tickets_response)
+                _emit(f"  ✅ FE001-示例数据: {total_tickets} 个工单")
                 enhancement_tests["FE001-示例数据"] = f"✅ {total_tickets} 个工单"
             else:
                 enhancement_tests["FE001-示例数据"] = f"❌ 失败({tickets_response.status_code})"
             
             # 测试Webhook通知(FE002)
-            webhooks_response = self.session.get(f"{API_BASE}/webhooks")
+            webhooks_response = self.session.get(f"{API_BASE}/webhooks", timeout=REQUEST_TIMEOUT)
             if webhooks_response.status_code == 200:
-                print("  ✅ FE002-Webhook通知系统可用")
+                _emit("  ✅ FE002-Webhook通知系统可用")
                 enhancement_tests["FE002-Webhook通知"] = "✅ 系统可用"
             else:
                 enhancement_tests["FE002-Webhook通知"] = f"❌ 失败({webhooks_response.status_code})"
             
             # 测试用户个人中心(FE003)
-            user_profile_response = self.session.get(f"{API_BASE}/user/profile")
+            user_profile_response = self.session.get(f"{API_BASE}/user/profile", timeout=REQUEST_TIMEOUT)
             if user_profile_response.status_code == 200:
-                print("  ✅ FE003-用户个人中心功能可用")
+                _emit("  ✅ FE003-用户个人中心功能可用")
                 enhancement_tests["FE003-用户个人中心"] = "✅ 功能可用"
             else:
                 enhancement_tests["FE003-用户个人中心"] = f"❌ 失败({user_profile_response.status_code})"
             
             # 测试管理员用户管理(FE005)
-            admin_users_response = self.session.get(f"{API_BASE}/admin/users")
+            admin_users_response = self.session.get(f"{API_BASE}/admin/users", params=_COUNT_ONLY, timeout=REQUEST_TIMEOUT)
             if admin_users_response.status_code == 200:
-                users = admin_users_response.json()
-                total_users = users.get("total", 0)
-                print(f"  ✅ FE005-管理员用户管理: {total_users} 个用户")
+                total_users = _list_total(admin_users_response)
+                _emit(f"  ✅ FE005-管理员用户管理: {total_users} 个用户")
                 enhancement_tests["FE005-用户管理"] = f"✅ {total_users} 个用户"
             else:
                 enhancement_tests["FE005-用户管理"] = f"❌ 失败({admin_users_response.status_code})"
             
             # 测试系统配置(FE006相关)
-            system_configs_response = self.session.get(f"{API_BASE}/admin/system/configs")
+            system_configs_response = self.session.get(f"{API_BASE}/admin/system/configs", timeout=REQUEST_TIMEOUT)
             if system_configs_response.status_code == 200:
-                print("  ✅ 系统配置管理功能可用")
+                _emit("  ✅ 系统配置管理功能可用")
                 enhancement_tests["系统配置管理"] = "✅ 功能可用"
             else:
                 enhancement_tests["系统配置管理"] = f"❌ 失败({system_configs_response.status_code})"
-                
-        except Exception as e:
-            print(f"  ❌ 功能增强测试异常: {e}")
-            enhancement_tests["系统状态"] = f"❌ 异常: {str(e)}"
         
         self.test_results["enhancement_features"] = enhancement_tests
         return enhancement_tests
@@ -288,33 +369,39 @@ class ProjectStatusTester:
         """生成综合测试报告"""
         print("\n📊 生成项目状态综合报告...")
         
+        # 单次遍历同时累计各模块和总体的 [总数, 成功数]
+        totals = {}
+        grand = [0, 0]
+        for category, tests in self.test_results.items():
+            if not isinstance(tests, dict):
+                continue
+            counts = totals[category] = [0, 0]
+            for v in tests.values():
+                hit = v[:1] == _SUCCESS_MARK
+                counts[0] += 1
+                counts[1] += hit
+                grand[0] += 1
+                grand[1] += hit
+        
         # 计算各模块成功率
-        def calculate_success_rate(tests: Dict[str, str]) -> float:
-            if not tests:
+        def calculate_success_rate(category: str) -> float:
+            total, success = totals.get(category, (0, 0))
+            if not total:
                 return 0.0
-            total = len(tests)
-            success = len([v for v in tests.values() if v.startswith("✅")])
             return (success / total) * 100
         
-        # 统计所有测试结果
-        all_tests = {}
-        for category, tests in self.test_results.items():
-            if isinstance(tests, dict):
-                all_tests.update(tests)
-        
-        total_tests = len(all_tests)
-        successful_tests = len([v for v in all_tests.values() if v.startswith("✅")])
+        total_tests, successful_tests = grand
         overall_success_rate = (successful_tests / total_tests) * 100 if total_tests > 0 else 0
         
         # 统计功能模块完成情况
         completed_features = []
-        if calculate_success_rate(self.test_results.get("basic_features", {})) > 80:
+        if calculate_success_rate("basic_features") > 80:
             completed_features.append("✅ 基础功能模块")
-        if calculate_success_rate(self.test_results.get("notification_system", {})) > 80:
+        if calculate_success_rate("notification_system") > 80:
             completed_features.append("✅ 通知系统模块")
-        if calculate_success_rate(self.test_results.get("user_management", {})) > 80:
+        if calculate_success_rate("user_management") > 80:
             completed_features.append("✅ 用户管理模块")
-        if calculate_success_rate(self.test_results.get("enhancement_features", {})) > 60:
+        if calculate_success_rate("enhancement_features") > 60:
             completed_features.append("✅ 功能增强模块")
         
         # 生成报告
@@ -328,10 +415,10 @@ class ProjectStatusTester:
                 "失败项": total_tests - successful_tests
             },
             "模块成功率": {
-                "基础功能": f"{calculate_success_rate(self.test_results.get('basic_features', {})):.1f}%",
-                "通知系统": f"{calculate_success_rate(self.test_results.get('notification_system', {})):.1f}%",
-                "API端点": f"{calculate_success_rate(self.test_results.get('api_endpoints', {})):.1f}%",
-                "功能增强": f"{calculate_success_rate(self.test_results.get('enhancement_features', {})):.1f}%"
+                "基础功能": f"{calculate_success_rate('basic_features'):.1f}%",
+                "通知系统": f"{calculate_success_rate('notification_system'):.1f}%",
+                "API端点": f"{calculate_success_rate('api_endpoints'):.1f}%",
+                "功能增强": f"{calculate_success_rate('enhancement_features'):.1f}%"
             },
             "已完成功能": completed_features,
             "详细结果": self.test_results
@@ -351,10 +438,17 @@ class ProjectStatusTester:
             print("\n❌ 系统基础健康检查失败，停止测试")
             return self.generate_summary_report()
         
-        self.test_core_apis()
-        self.test_notification_system()
-        self.test_email_system()
-        self.test_enhancement_features()
+        # 各模块测试互不依赖，并发执行使总耗时接近最慢的模块
+        module_tests = [
+            self.test_core_apis,
+            self.test_notification_system,
+            self.test_email_system,
+            self.test_enhancement_features,
+        ]
+        with ThreadPoolExecutor(max_workers=len(module_tests)) as executor:
+            for future in [executor.submit(_buffered, test) for test in module_tests]:
+                for line in future.result():
+                    print(line)
         
         # 生成最终报告
         report = self.generate_summary_report()
@@ -394,8 +488,10 @@ def main():
     report = tester.run_comprehensive_test()
     
     # 保存报告到文件
-    with open("project_status_report.json", "w", encoding="utf-8") as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
+    # 一次性序列化后以二进制写入，避免json.dump逐片段写文件
+    payload = json.dumps(report, ensure_ascii=False, indent=2).encode("utf-8")
+    with open("project_status_report.json", "wb") as f:
+        f.write(payload)
     
     print(f"\n📄 详细报告已保存到: project_status_report.json")
     
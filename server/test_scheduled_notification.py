@@ -5,11 +5,20 @@
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # API配置
 API_BASE = "http://localhost:8080/api"
 
+# 各测试通知共用的字段，按需合并差异字段
+BASE_PAYLOAD = {
+    "type": "system_maintenance",
+    "priority": "normal",
+    "channel": "email",
+    "recipient_id": 1,
+}
+
 def test_scheduled_notification():
     # 使用开发环境的测试token
     headers = {
@@ -19,58 +28,57 @@ def test_scheduled_notification():
     
     # 测试不同的时间格式
     future_time = datetime.now() + timedelta(seconds=5)
+    future_iso = future_time.isoformat()
     
     test_formats = [
-        future_time.isoformat(),  # 2025-08-22T00:11:00
-        future_time.isoformat() + "Z",  # 2025-08-22T00:11:00Z
+        future_iso,  # 2025-08-22T00:11:00
+        future_iso + "Z",  # 2025-08-22T00:11:00Z
         future_time.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),  # 2025-08-22T00:11:00.123456Z
         future_time.strftime("%Y-%m-%d %H:%M:%S"),  # 2025-08-22 00:11:00
     ]
     
-    for i, time_format in enumerate(test_formats):
-        print(f"\n🔄 测试格式 {i+1}: {time_format}")
-        
-        notification = {
-            "type": "system_maintenance",
+    # 所有请求复用同一个会话（连接池）
+    session = requests.Session()
+    session.headers.update(headers)
+    
+    def build_notification(i, time_format):
+        return BASE_PAYLOAD | {
             "title": f"定时通知测试 - 格式 {i+1}",
             "content": f"测试时间格式: {time_format}",
-            "priority": "normal",
-            "channel": "email",
-            "recipient_id": 1,
             "scheduled_at": time_format,
             "metadata": {
                 "test_format": i+1,
                 "original_format": time_format
             }
         }
-        
-        response = requests.post(f"{API_BASE}/admin/notifications", 
-                               json=notification, headers=headers)
-        
+    
+    # 各格式互不依赖，并发提交后按格式顺序输出结果
+    with ThreadPoolExecutor(max_workers=len(test_formats)) as executor:
+        responses = list(executor.map(
+            lambda args: session.post(f"{API_BASE}/admin/notifications", json=build_notification(*args)),
+            enumerate(test_formats),
+        ))
+    
+    for i, (time_format, response) in enumerate(zip(test_formats, responses)):
+        print(f"\n🔄 测试格式 {i+1}: {time_format}")
         print(f"   状态码: {response.status_code}")
         print(f"   响应: {response.text}")
         
         if response.status_code == 201:
             print("   ✅ 成功!")
-            break
         else:
             print(f"   ❌ 失败")
     
     # 测试没有scheduled_at的情况
     print(f"\n🔄 测试无定时发送:")
     
-    notification = {
-        "type": "system_maintenance", 
+    notification = BASE_PAYLOAD | {
         "title": "普通通知测试",
         "content": "这是一个普通通知，不设置定时发送",
-        "priority": "normal",
-        "channel": "email", 
-        "recipient_id": 1,
         "metadata": {"test_type": "immediate"}
     }
     
-    response = requests.post(f"{API_BASE}/admin/notifications",
-                           json=notification, headers=headers)
+    response = session.post(f"{API_BASE}/admin/notifications", json=notification)
     
     print(f"   状态码: {response.status_code}")
     print(f"   响应: {response.text}")
@@ -49,14 +49,19 @@ class WebSocketTester:
                     print("⚠️  等待响应超时")
                 
                 # 保持连接一段时间以接收可能的通知
+                # 接收与解析/输出分离：突发消息时socket读取不被打印阻塞
                 print("⏳ 保持连接30秒等待通知...")
+                queue: asyncio.Queue = asyncio.Queue(maxsize=256)
+                consumer = asyncio.create_task(self._handle_messages(queue))
                 try:
                     while True:
                         message = await asyncio.wait_for(websocket.recv(), timeout=30.0)
-                        data = json.loads(message)
-                        print(f"📱 收到实时消息: {data}")
+                        await queue.put(message)
                 except asyncio.TimeoutError:
+                    await queue.join()
                     print("✅ WebSocket连接测试完成")
+                finally:
+                    consumer.cancel()
                     
         except Exception as e:
             print(f"❌ WebSocket连接失败: {e}")
@@ -64,6 +69,18 @@ class WebSocketTester:
             
         return True
     
+    async def _handle_messages(self, queue: asyncio.Queue):
+        """消费接收队列中的WebSocket消息"""
+        while True:
+            message = await queue.get()
+            try:
+                data = json.loads(message)
+                print(f"📱 收到实时消息: {data}")
+            except ValueError:
+                print(f"⚠️  无法解析的消息: {message}")
+            finally:
+                queue.task_done()
+    
     def create_test_notification(self):
         """创建测试通知以验证实时推送"""
         print("📝 创建测试通知...")
@@ -102,21 +119,26 @@ class WebSocketTester:
             async with websockets.connect(self.ws_url, extra_headers=headers) as websocket:
                 print("✅ WebSocket连接建立")
                 
-                # 在另一个线程中创建通知
-                print("📝 正在创建测试通知...")
-                notification_id = self.create_test_notification()
-                
-                if notification_id:
-                    # 等待实时通知
-                    print("⏳ 等待实时通知推送...")
-                    try:
-                        message = await asyncio.wait_for(websocket.recv(), timeout=10.0)
-                        data = json.loads(message)
-                        print(f"📱 收到实时通知: {data}")
-                        return True
-                    except asyncio.TimeoutError:
-                        print("⚠️  未收到实时通知（可能是推送机制尚未集成）")
-                        return False
+                # 先开始接收再创建通知：推送可能早于创建请求返回，
+                # 阻塞的创建请求放到线程中执行，期间事件循环继续接收消息
+                recv_task = asyncio.create_task(websocket.recv())
+                try:
+                    print("📝 正在创建测试通知...")
+                    notification_id = await asyncio.to_thread(self.create_test_notification)
+                    
+                    if notification_id:
+                        # 等待实时通知
+                        print("⏳ 等待实时通知推送...")
+                        try:
+                            message = await asyncio.wait_for(recv_task, timeout=10.0)
+                            data = json.loads(message)
+                            print(f"📱 收到实时通知: {data}")
+                            return True
+                        except asyncio.TimeoutError:
+                            print("⚠️  未收到实时通知（可能是推送机制尚未集成）")
+                            return False
+                finally:
+                    recv_task.cancel()
                         
         except Exception as e:
             print(f"❌ 实时通知测试失败: {e}")
@@ -3,51 +3,59 @@
 from __future__ import annotations
 
 import base64
-import hashlib
 import hmac
 import time
-from typing import Dict
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
 
 import pytest
 
 from tests.utils import APIClient
 
 
+@lru_cache(maxsize=32)
+def _totp_key(secret: str) -> bytes:
+    """Decode a base32 OTP secret once per secret."""
+
+    return base64.b32decode(secret, casefold=True)
+
+
 def _generate_totp(secret: str, period: int = 30, digits: int = 6) -> str:
     """Generate TOTP code compatible with backend SimpleOTPService."""
 
-    key = base64.b32decode(secret, casefold=True)
     counter = int(time.time()) // period
-    msg = counter.to_bytes(8, "big")
-    digest = hmac.new(key, msg, hashlib.sha1).digest()
+    digest = hmac.digest(_totp_key(secret), counter.to_bytes(8, "big"), "sha1")
     offset = digest[-1] & 0x0F
     code_int = int.from_bytes(digest[offset : offset + 4], "big") & 0x7FFFFFFF
     return str(code_int % (10**digits)).zfill(digits)
 
 
+def _enable_otp(
+    api_client: APIClient,
+    access_token: str,
+    password: str,
+) -> tuple[str, list[str]]:
+    authed_client = api_client.with_auth(access_token)
+    try:
+        enable_resp = authed_client.post_json("/auth/enable-otp", {"password": password})
+        assert enable_resp.status_code == 200, enable_resp.text
+        enable_body = enable_resp.json()
+        assert enable_body.get("success") is True, enable_body
+        otp_data = enable_body.get("data", {})
+        secret = otp_data.get("secret")
+        assert secret, "启用OTP响应缺少密钥"
+        # 启用后立即解码并缓存密钥，后续生成验证码无需再做 base32 解码
+        _totp_key(secret)
+        backup_codes = otp_data.get("backup_codes") or []
+        return secret, backup_codes
+    finally:
+        authed_client.close()
+
+
 @pytest.mark.api
 @pytest.mark.integration
 class TestAuthenticationFlows:
-    def _enable_otp(
-        self,
-        api_client: APIClient,
-        access_token: str,
-        password: str,
-    ) -> tuple[str, list[str]]:
-        authed_client = api_client.with_auth(access_token)
-        try:
-            enable_resp = authed_client.post_json("/auth/enable-otp", {"password": password})
-            assert enable_resp.status_code == 200, enable_resp.text
-            enable_body = enable_resp.json()
-            assert enable_body.get("success") is True, enable_body
-            otp_data = enable_body.get("data", {})
-            secret = otp_data.get("secret")
-            assert secret, "启用OTP响应缺少密钥"
-            backup_codes = otp_data.get("backup_codes") or []
-            return secret, backup_codes
-        finally:
-            authed_client.close()
-
     def test_register_refresh_and_logout(
         self,
         api_client: APIClient,
@@ -102,21 +110,157 @@ class TestAuthenticationFlows:
         finally:
             authed_after.close()
 
-    def test_otp_trusted_device_flow(
+    def test_login_failure_scenarios(
+        self,
+        api_client: APIClient,
+        registered_user: Dict[str, str],
+    ) -> None:
+        email = registered_user["email"]
+
+        invalid_resp = api_client.post_json(
+            "/auth/login",
+            {
+                "email": email,
+                "password": "TotallyWrongPass!",
+            },
+        )
+        assert invalid_resp.status_code == 401, invalid_resp.text
+        invalid_body = invalid_resp.json()
+        assert invalid_body.get("msg") in {"Invalid email or password", "Login failed"}
+
+        refresh_resp = api_client.post_json(
+            "/auth/refresh",
+            {"refresh_token": "deadbeef"},
+        )
+        assert refresh_resp.status_code == 401, refresh_resp.text
+        refresh_body = refresh_resp.json()
+        assert refresh_body.get("error") in {"invalid_token", "refresh_failed", "token_expired"}
+
+    def test_disable_otp_restores_password_only_login(
         self,
         api_client: APIClient,
         registered_user: Dict[str, str],
+        logout_async: Callable[[Optional[str]], Future],
     ) -> None:
         email = registered_user["email"]
         password = registered_user["password"]
         access_token = registered_user["access_token"]
         refresh_token = registered_user["refresh_token"]
 
-        secret, _ = self._enable_otp(api_client, access_token, password)
+        secret, _ = _enable_otp(api_client, access_token, password)
+        api_client.logout(refresh_token)
+
+        # Without OTP now fails
+        missing_resp = api_client.post_json(
+            "/auth/login",
+            {
+                "email": email,
+                "password": password,
+            },
+        )
+        assert missing_resp.status_code == 400, missing_resp.text
+
+        login_resp = api_client.post_json(
+            "/auth/login",
+            {
+                "email": email,
+                "password": password,
+                "otp_code": _generate_totp(secret),
+            },
+        )
+        assert login_resp.status_code == 200, login_resp.text
+        login_data = login_resp.json()["data"]
+        new_access = login_data.get("access_token")
+        new_refresh = login_data.get("refresh_token")
+        assert new_access and new_refresh
+
+        authed = api_client.with_auth(new_access)
+        try:
+            disable_resp = authed.post_json("/auth/disable-otp", {"password": password})
+            assert disable_resp.status_code == 200, disable_resp.text
+            disable_body = disable_resp.json()
+            assert disable_body.get("success") is True
+        finally:
+            authed.close()
+
+        logout_async(new_refresh)
+
+        plain_login_resp = api_client.post_json(
+            "/auth/login",
+            {
+                "email": email,
+                "password": password,
+            },
+        )
+        assert plain_login_resp.status_code == 200, plain_login_resp.text
+        plain_data = plain_login_resp.json()["data"]
+        assert plain_data.get("user", {}).get("otp_enabled") is False
+        logout_async(plain_data.get("refresh_token"))
+
+
+@pytest.mark.api
+@pytest.mark.integration
+class TestOTPSharedUserFlows:
+    """OTP 场景的账号准备：注册并启用OTP。
+
+    每次故意失败的登录都会计入服务端的登录失败次数（同一邮箱每小时 5 次即锁定），
+    因此只有失败预算很小的正常路径用例共用类级账号；会制造失败登录的
+    负向用例（撤销设备后复用令牌、重复使用备用码）各自使用独立账号，
+    避免锁定后后续用例随执行顺序失败。会关闭OTP的用例保留在
+    ``TestAuthenticationFlows`` 中。
+    """
+
+    # 共享账号允许的故意失败登录次数，需低于服务端每小时 5 次的锁定阈值
+    SHARED_FAILED_LOGIN_BUDGET = 1
+
+    @staticmethod
+    def _make_otp_user(
+        api_client: APIClient,
+        user_factory: Callable[[], Dict[str, str]],
+    ) -> Dict[str, Any]:
+        user = user_factory()
+        secret, backup_codes = _enable_otp(api_client, user["access_token"], user["password"])
 
         # 原刷新令牌应该继续可用，先显式登出便于后续验证
-        api_client.logout(refresh_token)
+        api_client.logout(user["refresh_token"])
+        return {
+            "email": user["email"],
+            "password": user["password"],
+            "secret": secret,
+            "backup_codes": backup_codes,
+        }
+
+    @pytest.fixture(scope="class")
+    def otp_user(
+        self,
+        api_client: APIClient,
+        user_factory: Callable[[], Dict[str, str]],
+    ) -> Dict[str, Any]:
+        """Shared account for happy-path tests; see ``SHARED_FAILED_LOGIN_BUDGET``."""
+
+        return self._make_otp_user(api_client, user_factory)
+
+    @pytest.fixture
+    def isolated_otp_user(
+        self,
+        api_client: APIClient,
+        user_factory: Callable[[], Dict[str, str]],
+    ) -> Dict[str, Any]:
+        """Fresh account for tests that deliberately fail logins."""
+
+        return self._make_otp_user(api_client, user_factory)
 
+    def test_otp_trusted_device_flow(
+        self,
+        api_client: APIClient,
+        otp_user: Dict[str, Any],
+        logout_async: Callable[[Optional[str]], Future],
+    ) -> None:
+        email = otp_user["email"]
+        password = otp_user["password"]
+        secret = otp_user["secret"]
+
+        # 共享账号上唯一一次故意失败的登录，计入 SHARED_FAILED_LOGIN_BUDGET
         missing_otp_resp = api_client.post_json(
             "/auth/login",
             {
@@ -167,46 +311,17 @@ class TestAuthenticationFlows:
         assert refreshed.get("access_token"), "Trusted 登录 refresh 未返回访问令牌"
 
         # 销毁最新会话，避免污染
-        api_client.logout(new_refresh)
-
-    def test_login_failure_scenarios(
-        self,
-        api_client: APIClient,
-        registered_user: Dict[str, str],
-    ) -> None:
-        email = registered_user["email"]
-
-        invalid_resp = api_client.post_json(
-            "/auth/login",
-            {
-                "email": email,
-                "password": "TotallyWrongPass!",
-            },
-        )
-        assert invalid_resp.status_code == 401, invalid_resp.text
-        invalid_body = invalid_resp.json()
-        assert invalid_body.get("msg") in {"Invalid email or password", "Login failed"}
-
-        refresh_resp = api_client.post_json(
-            "/auth/refresh",
-            {"refresh_token": "deadbeef"},
-        )
-        assert refresh_resp.status_code == 401, refresh_resp.text
-        refresh_body = refresh_resp.json()
-        assert refresh_body.get("error") in {"invalid_token", "refresh_failed", "token_expired"}
+        logout_async(new_refresh)
 
     def test_trusted_device_revocation_requires_otp(
         self,
         api_client: APIClient,
-        registered_user: Dict[str, str],
+        isolated_otp_user: Dict[str, Any],
+        logout_async: Callable[[Optional[str]], Future],
     ) -> None:
-        email = registered_user["email"]
-        password = registered_user["password"]
-        access_token = registered_user["access_token"]
-        refresh_token = registered_user["refresh_token"]
-
-        secret, _ = self._enable_otp(api_client, access_token, password)
-        api_client.logout(refresh_token)
+        email = isolated_otp_user["email"]
+        password = isolated_otp_user["password"]
+        secret = isolated_otp_user["secret"]
 
         otp_code = _generate_totp(secret)
         login_payload = {
@@ -244,7 +359,10 @@ class TestAuthenticationFlows:
             assert list_body.get("code") == 0, list_body
             devices = list_body.get("data", [])
             assert devices, "启用记住设备后应存在可信设备记录"
-            device_id = devices[0]["id"]
+            # 按名称定位本用例登记的设备
+            device_id = next(
+                device["id"] for device in devices if device.get("device_name") == "pytest revoke device"
+            )
 
             revoke_resp = authed.delete(f"/user/trusted-devices/{device_id}")
             assert revoke_resp.status_code == 200, revoke_resp.text
@@ -275,24 +393,21 @@ class TestAuthenticationFlows:
         )
         assert recovery_login.status_code == 200, recovery_login.text
         recovery_data = recovery_login.json()["data"]
-        api_client.logout(recovery_data.get("refresh_token"))
+        logout_async(recovery_data.get("refresh_token"))
 
     def test_backup_code_single_use(
         self,
         api_client: APIClient,
-        registered_user: Dict[str, str],
+        isolated_otp_user: Dict[str, Any],
+        logout_async: Callable[[Optional[str]], Future],
     ) -> None:
-        email = registered_user["email"]
-        password = registered_user["password"]
-        access_token = registered_user["access_token"]
-        refresh_token = registered_user["refresh_token"]
-
-        secret, backup_codes = self._enable_otp(api_client, access_token, password)
+        email = isolated_otp_user["email"]
+        password = isolated_otp_user["password"]
+        secret = isolated_otp_user["secret"]
+        backup_codes = isolated_otp_user["backup_codes"]
         assert backup_codes, "启用OTP应返回备用码"
         backup_code = backup_codes[0]
 
-        api_client.logout(refresh_token)
-
         backup_login_resp = api_client.post_json(
             "/auth/login",
             {
@@ -305,7 +420,7 @@ class TestAuthenticationFlows:
         backup_data = backup_login_resp.json()["data"]
         assert backup_data.get("user", {}).get("otp_enabled") is True
 
-        api_client.logout(backup_data.get("refresh_token"))
+        logout_async(backup_data.get("refresh_token"))
 
         reuse_resp = api_client.post_json(
             "/auth/login",
@@ -326,64 +441,4 @@ class TestAuthenticationFlows:
             },
         )
         assert totp_resp.status_code == 200, totp_resp.text
-        api_client.logout(totp_resp.json()["data"].get("refresh_token"))
-
-    def test_disable_otp_restores_password_only_login(
-        self,
-        api_client: APIClient,
-        registered_user: Dict[str, str],
-    ) -> None:
-        email = registered_user["email"]
-        password = registered_user["password"]
-        access_token = registered_user["access_token"]
-        refresh_token = registered_user["refresh_token"]
-
-        secret, _ = self._enable_otp(api_client, access_token, password)
-        api_client.logout(refresh_token)
-
-        # Without OTP now fails
-        missing_resp = api_client.post_json(
-            "/auth/login",
-            {
-                "email": email,
-                "password": password,
-            },
-        )
-        assert missing_resp.status_code == 400, missing_resp.text
-
-        login_resp = api_client.post_json(
-            "/auth/login",
-            {
-                "email": email,
-                "password": password,
-                "otp_code": _generate_totp(secret),
-            },
-        )
-        assert login_resp.status_code == 200, login_resp.text
-        login_data = login_resp.json()["data"]
-        new_access = login_data.get("access_token")
-        new_refresh = login_data.get("refresh_token")
-        assert new_access and new_refresh
-
-        authed = api_client.with_auth(new_access)
-        try:
-            disable_resp = authed.post_json("/auth/disable-otp", {"password": password})
-            assert disable_resp.status_code == 200, disable_resp.text
-            disable_body = disable_resp.json()
-            assert disable_body.get("success") is True
-        finally:
-            authed.close()
-
-        api_client.logout(new_refresh)
-
-        plain_login_resp = api_client.post_json(
-            "/auth/login",
-            {
-                "email": email,
-                "password": password,
-            },
-        )
-        assert plain_login_resp.status_code == 200, plain_login_resp.text
-        plain_data = plain_login_resp.json()["data"]
-        assert plain_data.get("user", {}).get("otp_enabled") is False
-        api_client.logout(plain_data.get("refresh_token"))
+        logout_async(totp_resp.json()["data"].get("refresh_token"))
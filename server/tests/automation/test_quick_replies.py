@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-import time
+import uuid
+from types import MappingProxyType
 from typing import Dict
 
 import pytest
@@ -10,19 +11,21 @@ import pytest
 from tests.utils import APIClient
 
 
+# 固定字段只构造一次，fixture 中仅补充随名称变化的字段
+_QUICK_REPLY_TEMPLATE = MappingProxyType({
+    "category": "general",
+    "content": "Automated quick reply body.",
+    "tags": "auto,pytest",
+    "is_public": True,
+})
+
+
 @pytest.mark.api
 @pytest.mark.integration
 class TestQuickReplies:
     @pytest.fixture
     def quick_reply_payload(self) -> Dict[str, object]:
-        unique = int(time.time_ns())
-        return {
-            "name": f"Quick Reply {unique}",
-            "category": "general",
-            "content": "Automated quick reply body.",
-            "tags": "auto,pytest",
-            "is_public": True,
-        }
+        return {**_QUICK_REPLY_TEMPLATE, "name": f"Quick Reply {uuid.uuid4().hex[:12]}"}
 
     def test_quick_reply_flow(
         self,
@@ -39,15 +42,16 @@ class TestQuickReplies:
             created_id = data.get("id")
             assert created_id, "快速回复创建未返回 ID"
 
+            # 按唯一名称在服务端过滤，只取回新建的那一条
             list_resp = admin_api.get_json(
                 "/admin/automation/quick-replies",
-                params={"page_size": 50, "is_public": True},
+                params={"keyword": quick_reply_payload["name"], "is_public": True, "page_size": 1},
             )
             assert list_resp.status_code == 200, list_resp.text
             list_body = list_resp.json()
             assert list_body.get("success") is True, list_body
             replies = list_body.get("data", {}).get("replies", [])
-            assert any(reply.get("id") == created_id for reply in replies)
+            assert replies and replies[0].get("id") == created_id, "快速回复列表未包含新建记录"
 
             use_resp = admin_api.post_json(
                 f"/admin/automation/quick-replies/{created_id}/use",
@@ -2,14 +2,33 @@
 
 from __future__ import annotations
 
-import time
-from typing import Dict, List
+import copy
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 
 import pytest
 
 from tests.utils import APIClient
 
 
+# 固定字段只构造一次；fixture 每次深拷贝后再补充名称与依赖管理员ID的动作，
+# 嵌套的列表/字典不会在用例之间共享
+_RULE_TEMPLATE = {
+    "description": "Created by automated pytest suite.",
+    "rule_type": "assignment",
+    "trigger_event": "ticket.created",
+    "conditions": [
+        {
+            "field": "priority",
+            "operator": "eq",
+            "value": "normal",
+            "logic_op": "and",
+        }
+    ],
+}
+
+
 @pytest.mark.api
 @pytest.mark.integration
 class TestAutomationRules:
@@ -19,20 +38,9 @@ class TestAutomationRules:
         admin_id = user.get("id")
         assert admin_id, "Admin token payload 缺少 user.id"
 
-        unique = int(time.time_ns())
         return {
-            "name": f"Auto Rule {unique}",
-            "description": "Created by automated pytest suite.",
-            "rule_type": "assignment",
-            "trigger_event": "ticket.created",
-            "conditions": [
-                {
-                    "field": "priority",
-                    "operator": "eq",
-                    "value": "normal",
-                    "logic_op": "and",
-                }
-            ],
+            **copy.deepcopy(_RULE_TEMPLATE),
+            "name": f"Auto Rule {uuid.uuid4().hex[:12]}",
             "actions": [
                 {
                     "type": "assign",
@@ -59,23 +67,39 @@ class TestAutomationRules:
             created_rule_id = data.get("id")
             assert created_rule_id, "创建规则未返回 ID"
 
-            # List rules and ensure new rule present
-            list_resp = admin_api.get_json("/admin/automation/rules")
-            assert list_resp.status_code == 200, list_resp.text
-            list_body = list_resp.json()
-            assert list_body.get("success") is True, list_body
-            list_data = list_body.get("data", {})
-            rules: List[Dict[str, object]] = list_data.get("rules", [])
-            assert any(rule.get("id") == created_rule_id for rule in rules), "规则列表未包含新建规则"
-
-            # Fetch rule detail
-            detail_resp = admin_api.get_json(f"/admin/automation/rules/{created_rule_id}")
+            # Detail, stats and logs only depend on the rule id: fetch them concurrently
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                detail_future = pool.submit(admin_api.get_json, f"/admin/automation/rules/{created_rule_id}")
+                stats_future = pool.submit(admin_api.get_json, f"/admin/automation/rules/{created_rule_id}/stats")
+                logs_future = pool.submit(
+                    admin_api.get_json,
+                    "/admin/automation/logs",
+                    params={"rule_id": created_rule_id, "page_size": 5},
+                )
+            detail_resp = detail_future.result()
+            stats_resp = stats_future.result()
+            logs_resp = logs_future.result()
+
+            # Rule detail (also proves the new rule exists)
             assert detail_resp.status_code == 200, detail_resp.text
             detail_body = detail_resp.json()
             assert detail_body.get("success") is True, detail_body
             detail_data = detail_body.get("data", {})
             assert detail_data.get("name") == rule_payload["name"]
 
+            # Stats (should default to zero counts)
+            assert stats_resp.status_code == 200, stats_resp.text
+            stats_body = stats_resp.json()
+            assert stats_body.get("success") is True, stats_body
+            stats = stats_body.get("data", {})
+            assert stats.get("rule_id") == created_rule_id
+            assert "execution_count" in stats
+
+            # Execution logs (likely empty but endpoint should succeed)
+            assert logs_resp.status_code == 200, logs_resp.text
+            logs_body = logs_resp.json()
+            assert logs_body.get("success") is True, logs_body
+
             # Update rule (toggle active & priority comment)
             updated_payload = {
                 **rule_payload,
@@ -90,24 +114,6 @@ class TestAutomationRules:
             update_body = update_resp.json()
             assert update_body.get("success") is True, update_body
 
-            # Fetch stats (should default to zero counts)
-            stats_resp = admin_api.get_json(f"/admin/automation/rules/{created_rule_id}/stats")
-            assert stats_resp.status_code == 200, stats_resp.text
-            stats_body = stats_resp.json()
-            assert stats_body.get("success") is True, stats_body
-            stats = stats_body.get("data", {})
-            assert stats.get("rule_id") == created_rule_id
-            assert "execution_count" in stats
-
-            # Execution logs (likely empty but endpoint should succeed)
-            logs_resp = admin_api.get_json(
-                "/admin/automation/logs",
-                params={"rule_id": created_rule_id, "page_size": 5},
-            )
-            assert logs_resp.status_code == 200, logs_resp.text
-            logs_body = logs_resp.json()
-            assert logs_body.get("success") is True, logs_body
-
         finally:
             if created_rule_id is not None:
                 cleanup_resp = admin_api.delete(f"/admin/automation/rules/{created_rule_id}")
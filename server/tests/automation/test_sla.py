@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-import time
+import copy
+import uuid
 from typing import Dict
 
 import pytest
@@ -10,26 +11,29 @@ import pytest
 from tests.utils import APIClient
 
 
+# 固定字段只构造一次；fixture 每次深拷贝后再补充随名称变化的字段，
+# 嵌套的列表/字典不会在用例之间共享
+_SLA_TEMPLATE = {
+    "description": "Automated SLA config created via pytest.",
+    "is_default": False,
+    "response_time": 45,
+    "resolution_time": 180,
+    "working_hours": {
+        "monday": {"start": "09:00", "end": "18:00"},
+        "tuesday": {"start": "09:00", "end": "18:00"},
+    },
+    "escalation_rules": [
+        {"trigger_minutes": 60, "action": "notify_admin", "notify_users": [1]}
+    ],
+}
+
+
 @pytest.mark.api
 @pytest.mark.integration
 class TestSLAConfigs:
     @pytest.fixture
     def sla_payload(self) -> Dict[str, object]:
-        unique = int(time.time_ns())
-        return {
-            "name": f"Standard SLA {unique}",
-            "description": "Automated SLA config created via pytest.",
-            "is_default": False,
-            "response_time": 45,
-            "resolution_time": 180,
-            "working_hours": {
-                "monday": {"start": "09:00", "end": "18:00"},
-                "tuesday": {"start": "09:00", "end": "18:00"},
-            },
-            "escalation_rules": [
-                {"trigger_minutes": 60, "action": "notify_admin", "notify_users": [1]}
-            ],
-        }
+        return {**copy.deepcopy(_SLA_TEMPLATE), "name": f"Standard SLA {uuid.uuid4().hex[:12]}"}
 
     def test_sla_create_list_detail_delete(
         self,
@@ -46,12 +50,16 @@ class TestSLAConfigs:
             created_id = created.get("id")
             assert created_id, "SLA 创建未返回 ID"
 
-            list_resp = admin_api.get_json("/admin/automation/sla", params={"page_size": 50})
+            # 按唯一名称在服务端过滤，只取回新建的那一条
+            list_resp = admin_api.get_json(
+                "/admin/automation/sla",
+                params={"search": sla_payload["name"], "page_size": 1},
+            )
             assert list_resp.status_code == 200, list_resp.text
             list_body = list_resp.json()
             assert list_body.get("success") is True, list_body
             configs = list_body.get("data", {}).get("configs", [])
-            assert any(cfg.get("id") == created_id for cfg in configs), "SLA 列表未包含新建配置"
+            assert configs and configs[0].get("id") == created_id, "SLA 列表未包含新建配置"
 
         finally:
             if created_id is not None:
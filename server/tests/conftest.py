@@ -2,16 +2,31 @@
 
 from __future__ import annotations
 
+import base64
+import json
+import logging
 import os
+import random
 import secrets
+import threading
 import time
-from typing import Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 
 import pytest
 import requests
 
 from .utils import APIClient, APIError
 
+logger = logging.getLogger(__name__)
+
+# pytest-xdist 为每个 worker 设置该变量，串行运行时为空
+_XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER", "main")
+
+# 管理员令牌在 pytest 缓存（.pytest_cache）中的键，供各 xdist worker 共享
+_ADMIN_TOKEN_CACHE = "chronodesk/admin_tokens"
+_ADMIN_TOKEN_MIN_LIFETIME = 60  # 剩余有效期不足该秒数的缓存令牌视为过期
+
 
 def pytest_addoption(parser: pytest.Parser) -> None:
     parser.addoption(
@@ -20,6 +35,21 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default=None,
         help="Target API base url (default: http://localhost:8081/api)",
     )
+    parser.addoption(
+        "--slow",
+        action="store_true",
+        default=False,
+        help="Run tests marked as slow (skipped by default)",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: List[pytest.Item]) -> None:
+    if config.getoption("--slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test, use --slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
 
 @pytest.fixture(scope="session")
@@ -36,8 +66,12 @@ def api_client(api_base_url: str) -> APIClient:
 
 
 @pytest.fixture(scope="session", autouse=True)
-def _ensure_api_available(api_base_url: str) -> None:
+def _ensure_api_available(request: pytest.FixtureRequest, api_base_url: str) -> None:
     """Skip test session early if API 未启动."""
+    # 会话内有用例依赖管理员令牌时，先在后台发起登录，与健康检查并行
+    if any("admin_tokens" in item.fixturenames for item in request.session.items):
+        request.getfixturevalue("_admin_login")
+
     health_url = os.getenv("TEST_HEALTHCHECK_URL")
     if not health_url:
         # 假设 api_base_url 以 /api 结尾
@@ -62,34 +96,220 @@ def admin_credentials() -> Dict[str, str]:
 
 
 @pytest.fixture(scope="session")
-def admin_tokens(api_client: APIClient, admin_credentials: Dict[str, str]) -> Dict[str, str]:
+def _admin_login(
+    pytestconfig: pytest.Config,
+    api_client: APIClient,
+    api_base_url: str,
+    admin_credentials: Dict[str, str],
+) -> Future:
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="admin-login")
+    future = executor.submit(
+        _acquire_admin_tokens, pytestconfig, api_client, api_base_url, admin_credentials
+    )
+    yield future
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+@pytest.fixture(scope="session")
+def admin_tokens(_admin_login: Future) -> Dict[str, str]:
+    return _admin_login.result()
+
+
+def _acquire_admin_tokens(
+    config: pytest.Config,
+    api_client: APIClient,
+    api_base_url: str,
+    admin_credentials: Dict[str, str],
+) -> Dict[str, str]:
+    # pytest-xdist 各 worker 共享 .pytest_cache，令牌未过期时直接复用，避免每个 worker 重复登录
+    cache_key = _admin_cache_key(api_base_url, admin_credentials["email"])
+    cached = _load_cached_admin_tokens(config, cache_key)
+    if cached is not None and _token_lifetime(cached) > _ADMIN_TOKEN_MIN_LIFETIME:
+        # 服务端重启或数据重置后旧令牌可能失效，用一次轻量请求确认
+        probe = api_client.with_auth(str(cached.get("access_token")))
+        if probe.get_json("/auth/me").status_code == 200:
+            return cached
+
     try:
         payload = api_client.login(admin_credentials["email"], admin_credentials["password"])
     except APIError as exc:
         response = exc.response
         detail = response.text if response is not None else str(exc)
         pytest.skip(f"管理员登录失败，无法运行依赖测试: {detail}")
+    _store_admin_tokens(config, cache_key, payload)
     return payload
 
 
 @pytest.fixture(scope="session")
-def admin_api(api_client: APIClient, admin_tokens: Dict[str, str]) -> APIClient:
+def admin_api(
+    pytestconfig: pytest.Config,
+    api_client: APIClient,
+    api_base_url: str,
+    admin_credentials: Dict[str, str],
+    admin_tokens: Dict[str, str],
+) -> APIClient:
     token = admin_tokens.get("access_token")
     if not token:
         pytest.skip("管理员登录响应缺少 access_token")
 
     authed_client = api_client.with_auth(token)
+    # 整个会话只登录一次管理员；令牌在过期前由后台线程续期
+    stop = threading.Event()
+    refresher = threading.Thread(
+        target=_keep_admin_token_fresh,
+        args=(
+            api_client,
+            authed_client,
+            admin_tokens,
+            stop,
+            pytestconfig,
+            _admin_cache_key(api_base_url, admin_credentials["email"]),
+        ),
+        name="admin-token-refresh",
+        daemon=True,
+    )
+    refresher.start()
     yield authed_client
+    stop.set()
+    refresher.join()
     authed_client.close()
 
 
+@pytest.fixture(scope="session")
+def secondary_agent(admin_api: APIClient) -> Dict[str, Any]:
+    # 客服账号在整个会话内保持不变，每个 worker 只查询一次
+    response = admin_api.get_json(
+        "/admin/users",
+        params={
+            "role": "agent",
+            "page_size": 1,
+            "order_by": "id",
+            "order": "asc",
+        },
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body.get("code") == 0, body
+    items: List[Dict[str, Any]] = body.get("data", {}).get("items", [])
+    assert items, "缺少可用的客服/技术支持账号供分配"
+    return items[0]
+
+
+def _keep_admin_token_fresh(
+    api_client: APIClient,
+    authed_client: APIClient,
+    tokens: Dict[str, object],
+    stop: threading.Event,
+    config: pytest.Config,
+    cache_key: str,
+) -> None:
+    """Refresh the admin token at ~80% of its lifetime until ``stop`` is set."""
+
+    while True:
+        lifetime = _token_lifetime(tokens)
+        if lifetime <= 0 or stop.wait(max(lifetime * 0.8, 30)):
+            return
+
+        # 其他 worker 可能已经续期（旧 refresh token 随之失效），优先采用共享缓存中更新的令牌
+        shared = _load_cached_admin_tokens(config, cache_key)
+        if shared is not None and _jwt_exp(shared.get("access_token")) > _jwt_exp(tokens.get("access_token")):
+            refreshed = shared
+        else:
+            try:
+                refreshed = {**tokens, **api_client.refresh(str(tokens.get("refresh_token")))}
+            except APIError as exc:
+                logger.warning("Admin token refresh failed: %s", exc)
+                continue
+            _store_admin_tokens(config, cache_key, refreshed)
+        tokens.update(refreshed)
+        authed_client.token = refreshed.get("access_token") or authed_client.token
+
+
+def _admin_cache_key(api_base_url: str, email: str) -> str:
+    return f"{api_base_url}|{email}"
+
+
+def _load_cached_admin_tokens(config: pytest.Config, cache_key: str) -> Optional[Dict[str, str]]:
+    # -p no:cacheprovider 时没有 config.cache
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        return None
+    return cache.get(_ADMIN_TOKEN_CACHE, {}).get(cache_key)
+
+
+def _store_admin_tokens(config: pytest.Config, cache_key: str, tokens: Dict[str, object]) -> None:
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        return
+    entries = cache.get(_ADMIN_TOKEN_CACHE, {})
+    entries[cache_key] = tokens
+    cache.set(_ADMIN_TOKEN_CACHE, entries)
+
+
+def _jwt_exp(token: object) -> int:
+    """Read the ``exp`` claim of a JWT without verifying it; 0 when unavailable."""
+
+    try:
+        payload = str(token).split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return int(claims.get("exp", 0))
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return 0
+
+
+def _token_lifetime(tokens: Dict[str, object]) -> float:
+    """Seconds until the access token expires, falling back to ``expires_in``."""
+
+    exp = _jwt_exp(tokens.get("access_token"))
+    if exp:
+        return exp - time.time()
+    return float(tokens.get("expires_in") or 0)
+
+
+@pytest.fixture(scope="session")
+def logout_pool() -> ThreadPoolExecutor:
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="logout") as pool:
+        yield pool
+
+
+@pytest.fixture
+def logout_async(
+    api_client: APIClient,
+    logout_pool: ThreadPoolExecutor,
+) -> Callable[[Optional[str]], Future]:
+    """Fire cleanup logouts in the background; they are joined and checked at teardown."""
+
+    futures: list[Future] = []
+
+    def submit(refresh_token: Optional[str]) -> Future:
+        future = api_client.logout_async(refresh_token, logout_pool)
+        futures.append(future)
+        return future
+
+    yield submit
+    for future in futures:
+        future.result()
+
+
+@pytest.fixture(scope="session")
+def user_factory(api_client: APIClient) -> Callable[[], Dict[str, str]]:
+    """Register a fresh user on demand, for fixtures wider than function scope."""
+
+    return lambda: _register_user(api_client)
+
+
 @pytest.fixture
-def registered_user(api_client: APIClient) -> Dict[str, str]:
+def registered_user(user_factory: Callable[[], Dict[str, str]]) -> Dict[str, str]:
+    return user_factory()
+
+
+def _register_user(api_client: APIClient) -> Dict[str, str]:
     last_error: APIError | None = None
     for attempt in range(3):
-        timestamp = int(time.time_ns())
-        email = f"auth_test+{timestamp}@example.com"
-        username = f"auth_user_{timestamp}"
+        # 附加 worker 标识，保证并行执行时各 worker 注册的账号互不冲突
+        suffix = f"{_XDIST_WORKER}_{time.time_ns()}"
+        email = f"auth_test+{suffix}@example.com"
+        username = f"auth_user_{suffix}"
         password = _generate_strong_password()
 
         payload = {
@@ -108,12 +328,17 @@ def registered_user(api_client: APIClient) -> Dict[str, str]:
             break
         except APIError as exc:
             last_error = exc
-            time.sleep(0.05)
+            status = exc.response.status_code if exc.response is not None else None
+            if status == 409:
+                # 账号冲突：换一个后缀立即重试
+                continue
+            if status is not None and status < 500 and status != 429:
+                # 校验类错误重试也不会成功
+                _fail_registration(exc)
+            time.sleep(0.02 * (2**attempt) + random.random() * 0.01)
     else:
         assert last_error is not None
-        response = last_error.response
-        detail = response.text if response is not None else str(last_error)
-        pytest.fail(f"Failed to register test user: {detail}")
+        _fail_registration(last_error)
 
     return {
         "email": email,
@@ -124,11 +349,18 @@ def registered_user(api_client: APIClient) -> Dict[str, str]:
     }
 
 
+def _fail_registration(error: APIError) -> None:
+    response = error.response
+    detail = response.text if response is not None else str(error)
+    pytest.fail(f"Failed to register test user: {detail}")
+
+
 def _generate_strong_password() -> str:
     """Generate a password satisfying policy without triple repeats."""
 
-    while True:
-        token = secrets.token_hex(6)
-        password = f"Aa1!{token}Z"
-        if all(password[i] != password[i + 1] or password[i] != password[i + 2] for i in range(len(password) - 2)):
-            return password
+    # 前缀以 "!" 结尾、后缀为 "Z"，都不会与十六进制字符连成三连，只需处理随机部分
+    chars = list(secrets.token_hex(6))
+    for i in range(2, len(chars)):
+        if chars[i] == chars[i - 1] == chars[i - 2]:
+            chars[i] = format((int(chars[i], 16) + 1) % 16, "x")
+    return f"Aa1!{''.join(chars)}Z"
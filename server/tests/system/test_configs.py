@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import io
 import json
 import time
 from typing import Dict
@@ -45,11 +44,8 @@ class TestSystemConfigs:
             created = create_resp.json().get("data", {})
             created_key = created.get("key")
             assert created_key == config_payload["key"]
-
-            detail_resp = admin_api.get_json(f"/admin/configs/{created_key}")
-            detail_body = detail_resp.json()
-            assert detail_body.get("success") is True
-            assert detail_body.get("data", {}).get("value") == config_payload["value"]
+            # 创建接口回显已保存的配置，无需再单独查询详情
+            assert created.get("value") == config_payload["value"]
 
             update_payload = {
                 **config_payload,
@@ -91,21 +87,25 @@ class TestSystemConfigs:
             assert stats_resp.status_code == 200, stats_resp.text
             assert stats_resp.json().get("success") is True
 
+            # 导出结果直接作为上传文件对象，不再额外缓存整份内容
             export_resp = admin_api.session.get(
                 admin_api._build_url("/admin/configs/export"),
+                headers=admin_api.auth_headers,
                 params={"format": "json"},
+                stream=True,
+                timeout=admin_api.timeout,
             )
-            assert export_resp.status_code == 200, export_resp.text
-            exported_payload = export_resp.content
-
-            files = {"file": ("configs.json", io.BytesIO(exported_payload), "application/json")}
-            auth_header = admin_api.session.headers.get("Authorization")
-            import_resp = requests.post(
-                admin_api._build_url("/admin/configs/import"),
-                headers={"Authorization": auth_header} if auth_header else None,
-                files=files,
-                timeout=30,
-            )
+            with export_resp:
+                assert export_resp.status_code == 200, export_resp.text
+                export_resp.raw.decode_content = True
+
+                files = {"file": ("configs.json", export_resp.raw, "application/json")}
+                import_resp = requests.post(
+                    admin_api._build_url("/admin/configs/import"),
+                    headers=admin_api.auth_headers or None,
+                    files=files,
+                    timeout=30,
+                )
             assert import_resp.status_code == 200, import_resp.text
             assert import_resp.json().get("success") is True
 
@@ -113,8 +113,12 @@ class TestSystemConfigs:
             assert init_resp.status_code == 200, init_resp.text
 
         finally:
+            # 删除接口会同步淘汰该键的缓存，仅在未能删除时才整体清理缓存
+            deleted = False
             if created_key is not None:
                 delete_resp = admin_api.delete(f"/admin/configs/{created_key}")
                 if delete_resp.status_code == 200:
                     assert delete_resp.json().get("success") is True
-            admin_api.post_json("/admin/configs/cache/clear", {})
+                    deleted = True
+            if not deleted:
+                admin_api.post_json("/admin/configs/cache/clear", {})
@@ -4,18 +4,53 @@ from __future__ import annotations
 
 import logging
 import os
-import time
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = int(os.getenv("TEST_REQUEST_TIMEOUT", "15"))
+# total attempts per request, including the first one
 DEFAULT_MAX_RETRIES = int(os.getenv("TEST_REQUEST_MAX_RETRIES", "3"))
-DEFAULT_RETRY_DELAY = float(os.getenv("TEST_REQUEST_RETRY_DELAY", "1.0"))
+# urllib3 backoff factor, not a fixed sleep: retries wait roughly 0, 2x, 4x ... seconds
+# (Retry-After wins when the server sends it). Renamed from TEST_REQUEST_RETRY_DELAY,
+# which used to be a fixed pause between attempts.
+DEFAULT_RETRY_DELAY = float(os.getenv("TEST_REQUEST_BACKOFF_FACTOR", "0.2"))
+DEFAULT_POOL_CONNECTIONS = 16
+DEFAULT_POOL_MAXSIZE = 32
+
+
+class APIResponse(requests.Response):
+    """Response whose text and JSON body are decoded at most once.
+
+    Tests usually call ``.json()`` several times on the same response (status
+    assertion, then data extraction); the decoded body is kept on the instance.
+    """
+
+    @cached_property
+    def text(self) -> str:
+        return requests.Response.text.fget(self)
+
+    def json(self, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().json(**kwargs)
+        try:
+            return self._json_body
+        except AttributeError:
+            self._json_body = super().json()
+            return self._json_body
+
+
+def _as_api_response(response: requests.Response, *args: Any, **kwargs: Any) -> requests.Response:
+    response.__class__ = APIResponse
+    return response
 
 
 class APIError(RuntimeError):
@@ -26,18 +61,46 @@ class APIError(RuntimeError):
         self.response = response
 
 
-@dataclass
+@dataclass(slots=True)
 class APIClient:
     base_url: str
     timeout: int = DEFAULT_TIMEOUT
     max_retries: int = DEFAULT_MAX_RETRIES
+    # backoff factor for urllib3 retries, see DEFAULT_RETRY_DELAY
     retry_delay: float = DEFAULT_RETRY_DELAY
+    token: Optional[str] = field(default=None, repr=False)
+    session: Optional[requests.Session] = field(default=None, repr=False)
+    # internal state populated in __post_init__; slots require it to be declared
+    _owns_session: bool = field(init=False, default=False, repr=False, compare=False)
+    # path -> absolute url; the suite only hits a small set of endpoints
+    _url_cache: Dict[str, str] = field(init=False, default_factory=dict, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         # remove trailing slash for consistency
         self.base_url = self.base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
+        # views created by with_auth share the parent's connection pool
+        self._owns_session = self.session is None
+        if self.session is None:
+            self.session = requests.Session()
+            self.session.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+            self.session.hooks["response"].append(_as_api_response)
+            # one keep-alive pool sized for the concurrent helpers; urllib3 retries with
+            # exponential backoff and honours Retry-After. POST is only retried when the
+            # connection could not be established, so non-idempotent writes are never replayed.
+            adapter = HTTPAdapter(
+                pool_connections=DEFAULT_POOL_CONNECTIONS,
+                pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                max_retries=Retry(
+                    # max_retries counts attempts, Retry(total=...) counts retries after the first
+                    total=max(self.max_retries - 1, 0),
+                    backoff_factor=self.retry_delay,
+                    status_forcelist=(502, 503, 504),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                ),
+            )
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
 
     # ------------------------------------------------------------------
     # Core request helper
@@ -53,40 +116,27 @@ class APIClient:
         expected_status: Optional[int] = None,
     ) -> requests.Response:
         url = self._build_url(path)
-        attempt = 0
-        last_exc: Optional[Exception] = None
-
-        while attempt < self.max_retries:
-            try:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=json,
-                    params=params,
-                    timeout=self.timeout,
-                )
-
-                if expected_status is not None and response.status_code != expected_status:
-                    raise APIError(
-                        f"Unexpected status {response.status_code} (expected {expected_status})",
-                        response=response,
-                    )
-                return response
-            except (requests.ConnectionError, requests.Timeout) as exc:
-                last_exc = exc
-                attempt += 1
-                logger.warning(
-                    "Request %s %s failed (attempt %s/%s): %s",
-                    method,
-                    url,
-                    attempt,
-                    self.max_retries,
-                    exc,
-                )
-                time.sleep(self.retry_delay)
-
-        raise APIError(f"Request {method} {url} failed after retries", response=None) from last_exc
+        if self.token:
+            headers = {**self.auth_headers, **(headers or {})}
+        try:
+            response = self.session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                json=json,
+                params=params,
+                timeout=self.timeout,
+            )
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            logger.warning("Request %s %s failed: %s", method, url, exc)
+            raise APIError(f"Request {method} {url} failed after retries", response=None) from exc
+
+        if expected_status is not None and response.status_code != expected_status:
+            raise APIError(
+                f"Unexpected status {response.status_code} (expected {expected_status})",
+                response=response,
+            )
+        return response
 
     # ------------------------------------------------------------------
     # Convenience helpers
@@ -97,25 +147,43 @@ class APIClient:
     def get_json(self, path: str, *, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None) -> requests.Response:
         return self.request("GET", path, headers=headers, params=params)
 
+    def get_many(
+        self,
+        calls: Iterable[Tuple[str, Optional[Dict[str, Any]]]],
+        *,
+        max_workers: int = 4,
+    ) -> List[requests.Response]:
+        """Issue independent ``(path, params)`` GETs concurrently; responses keep input order."""
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda call: self.get_json(call[0], params=call[1]), calls))
+
     def put_json(self, path: str, payload: Dict[str, Any], *, headers: Optional[Dict[str, str]] = None) -> requests.Response:
         return self.request("PUT", path, json=payload, headers=headers)
 
     def delete(self, path: str, *, headers: Optional[Dict[str, str]] = None, expected_status: Optional[int] = None) -> requests.Response:
         return self.request("DELETE", path, headers=headers, expected_status=expected_status)
 
+    @property
+    def auth_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
     def with_auth(self, token: str) -> "APIClient":
-        clone = APIClient(
+        """Return a view sending ``token`` over this client's session."""
+
+        return self.__class__(
             base_url=self.base_url,
             timeout=self.timeout,
             max_retries=self.max_retries,
             retry_delay=self.retry_delay,
+            token=token,
+            session=self.session,
         )
-        clone.session.headers.update(self.session.headers)
-        clone.session.headers["Authorization"] = f"Bearer {token}"
-        return clone
 
     def close(self) -> None:
-        self.session.close()
+        # only the owning client tears down the shared pool
+        if self._owns_session:
+            self.session.close()
 
     # ------------------------------------------------------------------
     # Authentication helpers
@@ -166,10 +234,17 @@ class APIClient:
             raise APIError("Unexpected logout response", response=response)
         return body
 
+    def logout_async(self, refresh_token: Optional[str], executor: Executor) -> "Future[Dict[str, Any]]":
+        """Submit a logout to ``executor``; the caller joins the future later."""
+
+        return executor.submit(self.logout, refresh_token)
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
     def _build_url(self, path: str) -> str:
-        if not path.startswith("/"):
-            path = f"/{path}"
-        return f"{self.base_url}{path}"
+        url = self._url_cache.get(path)
+        if url is None:
+            url = f"{self.base_url}{path if path.startswith('/') else f'/{path}'}"
+            self._url_cache[path] = url
+        return url
@@ -11,17 +11,23 @@
 import requests
 import json
 
+# 所有检查共用一个会话，复用到 localhost 的 keep-alive 连接
+SESSION = requests.Session()
+SESSION.headers.update({"Connection": "keep-alive"})
+# 认证头只随后端API请求发送，不带给前端开发服务器
+API_HEADERS = {"Authorization": "Bearer test-token"}
+REQUEST_TIMEOUT = 5
+
 def test_backend_apis():
     """测试后端API支持"""
     print("🔍 测试后端API支持...")
     
-    headers = {"Authorization": "Bearer test-token"}
     base_url = "http://localhost:8081/api"
     
     # 测试邮件配置API
     print("   📧 测试邮件配置API...")
     try:
-        response = requests.get(f"{base_url}/admin/email-config", headers=headers)
+        response = SESSION.get(f"{base_url}/admin/email-config", headers=API_HEADERS, timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             if data.get('code') == 0 and 'data' in data:
@@ -36,7 +42,7 @@ def test_backend_apis():
     # 测试Webhook配置API
     print("   🔗 测试Webhook配置API...")
     try:
-        response = requests.get(f"{base_url}/webhooks", headers=headers)
+        response = SESSION.get(f"{base_url}/webhooks", headers=API_HEADERS, timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
             print("   ✅ Webhook配置API正常")
         elif response.status_code == 404:
@@ -49,7 +55,7 @@ def test_backend_apis():
     # 测试系统配置API
     print("   ⚙️ 测试系统配置API...")
     try:
-        response = requests.get(f"{base_url}/admin/configs", headers=headers)
+        response = SESSION.get(f"{base_url}/admin/configs", headers=API_HEADERS, timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
             print("   ✅ 系统配置API正常")
         else:
@@ -64,7 +70,7 @@ def test_frontend_accessibility():
     
     try:
         # 测试开发服务器
-        response = requests.get("http://localhost:3001", timeout=5)
+        response = SESSION.get("http://localhost:3001", timeout=REQUEST_TIMEOUT)
         if response.status_code == 200:
             print("   ✅ 前端开发服务器运行正常")
             